@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark harness for the energy‑scraper suite
+==============================================
+Runs a workload offline and reports wall time, throughput and peak RSS (of
+this process, or of the service child for `serve`).  Cases
+-------
+parse <dir>   – push every *.pdf (MEPSO demand + gen mix) and *.xlsx (OST)
+                in <dir> through the parsers via memory‑mapped payloads;
+                with --memo the parse memo is consulted (warm reruns).
+download      – serve --files bodies of --size MiB from a local HTTP server
+                and fetch them with --workers threads through
+                `payload.download`, once per --spool setting (each in a
+                fresh process, so every run has its own peak RSS);
+                `content` is the old fully buffered `resp.content` path.
+vre [dir]     – write a synthetic weather + eligibility grid (--grid YxX,
+                --hours) to <dir> (default: a temp folder) and run the
+                memory‑mapped VRE engine over it in --chunk hour blocks.
+
+serve [dir]   – start the query service over the outputs in <dir> (default:
+                OUTPUT_DIR) in a child process and hammer it with --clients
+                keep‑alive connections drawing from --queries distinct
+                slices; reports requests/s, latency percentiles and the
+                peak RSS of the server (client RSS listed separately).
+
+    python -m energy_scrapers.benchmark parse data/samples --repeat 3
+    python -m energy_scrapers.benchmark parse data/samples --memo /tmp/memo.sqlite
+    python -m energy_scrapers.benchmark download --files 64 --size 8 --spool content,64K,1M,16M
+    python -m energy_scrapers.benchmark vre --grid 100x120 --hours 17544 --chunk 72
+    python -m energy_scrapers.benchmark serve data --clients 16 --requests 20000
+"""
+from __future__ import annotations
+import argparse, glob, os, random, resource, sys, tempfile, threading, time
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MiB (Linux: KiB, macOS: B)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / 1024
+
+
+def report(case: str, n: int, unit: str, seconds: float, rss: float | None = None,
+           rss_of: str = "", **extra) -> None:
+    """One summary line; *rss* overrides this process' peak RSS (label *rss_of*)."""
+    rate  = n / seconds if seconds else float("inf")
+    rss   = peak_rss_mb() if rss is None else rss
+    extra = "".join(f", {k}={v}" for k, v in extra.items())
+    print(f"⏱  {case}: {n:,} {unit} in {seconds:.2f}s ({rate:,.1f} {unit}/s), "
+          f"peak RSS{f' ({rss_of})' if rss_of else ''} {rss:.1f} MiB{extra}")
+
+# ───────────── cases ────────────────────────────────────────────────────
+
+def bench_parse(args) -> None:
+    from energy_scrapers import download_mepso, mepso_gen_scraper, download_ost
+    from energy_scrapers.payload import Payload
+    from energy_scrapers.memo import ParseMemo
+
+    pdfs  = sorted(glob.glob(os.path.join(args.path, "*.pdf")))
+    xlsxs = sorted(glob.glob(os.path.join(args.path, "*.xlsx")))
+    if not pdfs and not xlsxs:
+        sys.exit(f"no *.pdf / *.xlsx payloads in {args.path}")
+
+    dm, gm = download_mepso, mepso_gen_scraper
+    memo = ParseMemo(args.memo)
+    n, parsed, t0 = 0, 0, time.perf_counter()
+    for _ in range(args.repeat):
+        for path in pdfs:
+            with Payload.from_path(path) as p:
+                v = p.view
+                vals = memo.parse(p.digest, "mepso", dm.PARSER_VERSION,
+                                  lambda: dm.extract_via_table(v) or dm.extract_via_regex(v))
+                mix  = memo.parse(p.digest, "mepso_gen", gm.PARSER_VERSION,
+                                  lambda: gm.extract_via_table(v) or gm.extract_via_regex(v))
+            n, parsed = n + 1, parsed + bool(vals or mix)
+        for path in xlsxs:
+            with Payload.from_path(path) as p:
+                book = memo.parse(p.digest, "ost", download_ost.PARSER_VERSION,
+                                  lambda: download_ost._read_workbook(p.view))
+            n, parsed = n + 1, parsed + bool(book and book[1])
+    memo.close()
+    report("parse", n, "payloads", time.perf_counter() - t0, parsed=parsed,
+           memo_hits=memo.hits)
+
+
+class _QuietFiles:
+    """SimpleHTTPRequestHandler factory for *root* without request logging."""
+
+    def __init__(self, root: str) -> None:
+        self.root = root
+
+    def __call__(self, *a, **kw):
+        from http.server import SimpleHTTPRequestHandler
+
+        class Handler(SimpleHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args) -> None:
+                pass
+
+        return Handler(*a, directory=self.root, **kw)
+
+
+def _file_server(root: str, ready) -> None:
+    from http.server import ThreadingHTTPServer
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _QuietFiles(root))
+    ready.put(srv.server_address[1])
+    srv.serve_forever()
+
+
+def _download_child(urls: list[str], workers: int, spool: int | None, out) -> None:
+    import requests
+    from concurrent.futures import ThreadPoolExecutor
+    from energy_scrapers.payload import download
+    local = threading.local()
+
+    def get(url: str) -> tuple[int, bool]:
+        if not hasattr(local, "session"):
+            local.session = requests.Session()
+        if spool is None:                             # whole body in RAM per worker
+            body = local.session.get(url, timeout=60).content
+            return len(body), False
+        with download(url, session=local.session, timeout=60, max_size=spool) as p:
+            p.digest                                  # touch every byte, like a parser would
+            return p.size, p.spilled
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(workers) as pool:
+        done = list(pool.map(get, urls))
+    out.put((time.perf_counter() - t0, sum(n for n, _ in done), sum(s for _, s in done), peak_rss_mb()))
+
+
+def _size(spec: str) -> int | None:
+    """'content' → None, '64K' / '1M' / '4096' → bytes."""
+    if spec == "content":
+        return None
+    mult = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}.get(spec[-1].upper(), 1)
+    return int(float(spec.rstrip("kKmMgG")) * mult)
+
+
+def bench_download(args) -> None:
+    import multiprocessing
+
+    with tempfile.TemporaryDirectory() as root:
+        with open(os.path.join(root, "body.bin"), "wb") as fp:
+            for _ in range(args.size):
+                fp.write(os.urandom(1 << 20))
+        ready  = multiprocessing.Queue()
+        server = multiprocessing.Process(target=_file_server, args=(root, ready), daemon=True)
+        server.start()
+        port = ready.get(timeout=30)
+        urls = [f"http://127.0.0.1:{port}/body.bin?n={i}" for i in range(args.files)]
+        try:
+            for spec in args.spool.split(","):
+                out   = multiprocessing.Queue()
+                child = multiprocessing.Process(target=_download_child,
+                                                args=(urls, args.workers, _size(spec), out))
+                child.start()
+                seconds, nbytes, spilled, rss = out.get(timeout=600)
+                child.join()
+                report("download", nbytes >> 20, "MiB", seconds, rss=rss, rss_of="client",
+                       spool=spec, files=len(urls), workers=args.workers, spilled=spilled)
+        finally:
+            server.terminate()
+
+
+def bench_vre(args) -> None:
+    from energy_scrapers import get_resource_options as vre
+
+    ny, nx = (int(v) for v in args.grid.lower().split("x"))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = tmp if args.path == "." else args.path
+        if not os.path.exists(os.path.join(path, "time.npy")):
+            vre.synthetic(path, ny, nx, args.hours)
+        weather = vre.load_weather(path)
+        regions, names, masks = vre.load_eligibility(path)
+        cells   = weather["wnd100m"][0].size * len(weather["time"]) * len(masks)
+        t0 = time.perf_counter()
+        for _ in range(args.repeat):
+            profiles, _ = vre.get_resource_options(weather, regions, names, masks, chunk_hours=args.chunk or vre.DEFAULT_CHUNK)
+        report("vre", cells * args.repeat, "cell-hours", time.perf_counter() - t0,
+               grid=f"{ny}x{nx}", hours=len(profiles), profiles=profiles.shape[1])
+
+
+def _serve_child(path: str, ready, stop) -> None:
+    from energy_scrapers import serve
+    srv    = serve.QueryServer(serve.Store(path), port=0)
+    tables = {name: (str(t["day"][0]), str(t["day"][-1]), [v for v in t if v not in ("day", "hour")])
+              for name, t in srv.store.tables.items() if len(t["day"])}
+    ready.put((srv.server_address[1], tables))
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    stop.wait()
+    ready.put(peak_rss_mb())                          # the service's own footprint
+    srv.shutdown()
+
+
+def bench_serve(args) -> None:
+    import http.client, multiprocessing, numpy as np
+    from urllib.parse import urlencode
+    from energy_scrapers.framework import load_config
+
+    path  = load_config()["OUTPUT_DIR"] if args.path == "." else args.path
+    ready, stop = multiprocessing.Queue(), multiprocessing.Event()
+    child = multiprocessing.Process(target=_serve_child, args=(path, ready, stop), daemon=True)
+    child.start()
+    port, tables = ready.get(timeout=120)
+    if not tables:
+        child.terminate()
+        sys.exit(f"no scraper outputs in {path}")
+
+    rng, pool = random.Random(0), []
+    while len(pool) < args.queries:
+        name = rng.choice(sorted(tables))
+        first, last, variables = tables[name]
+        span = (np.datetime64(last) - np.datetime64(first)).astype(int)
+        a, b = sorted(rng.randint(0, span) for _ in range(2))
+        pool.append("/series?" + urlencode({
+            "source": name, "variable": rng.choice(variables), "freq": rng.choice(("hour", "day", "month")),
+            "start": str(np.datetime64(first) + a), "end": str(np.datetime64(first) + b)}))
+
+    lat: list[float] = []
+    per_client = args.requests // args.clients
+
+    def client(seed: int) -> None:
+        r, conn, mine = random.Random(seed), http.client.HTTPConnection("127.0.0.1", port), []
+        for _ in range(per_client):
+            t = time.perf_counter()
+            conn.request("GET", r.choice(pool))
+            resp = conn.getresponse()
+            resp.read()
+            mine.append(time.perf_counter() - t)
+            if resp.status != 200:
+                raise RuntimeError(f"HTTP {resp.status}")
+        conn.close()
+        lat.extend(mine)
+
+    t0 = time.perf_counter()
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(args.clients)]
+    for th in threads:
+        th.start()
+    for th in threads:
+        th.join()
+    elapsed = time.perf_counter() - t0
+    stop.set()
+    server_rss = ready.get(timeout=30)
+    child.join(5)
+    child.terminate()
+
+    ms = np.percentile(np.array(lat) * 1000, [50, 95, 99])
+    report("serve", len(lat), "requests", elapsed, rss=server_rss, rss_of="server",
+           clients=args.clients, distinct=len(pool), p50=f"{ms[0]:.2f}ms", p95=f"{ms[1]:.2f}ms",
+           p99=f"{ms[2]:.2f}ms", client_rss=f"{peak_rss_mb():.1f}MiB")
+
+
+CASES = {"parse": bench_parse, "download": bench_download, "vre": bench_vre, "serve": bench_serve}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Energy scraper benchmarks")
+    parser.add_argument("case", choices=CASES.keys())
+    parser.add_argument("path", nargs="?", default=".", help="input directory for the case")
+    parser.add_argument("--repeat", type=int, default=1, help="passes over the inputs")
+    parser.add_argument("--memo", help="parse memo SQLite file (parse case)")
+    parser.add_argument("--files", type=int, default=32, help="bodies to fetch (download case)")
+    parser.add_argument("--size", type=int, default=8, help="MiB per body (download case)")
+    parser.add_argument("--workers", type=int, default=32, help="fetch threads (download case)")
+    parser.add_argument("--spool", default="content,64K,1M,16M",
+                        help="comma list of SPOOL_MAX values or 'content' (download case)")
+    parser.add_argument("--grid", default="100x120", help="synthetic grid YxX (vre case)")
+    parser.add_argument("--hours", type=int, default=8760, help="synthetic hours (vre case)")
+    parser.add_argument("--chunk", type=int, help="hours per chunk (vre case)")
+    parser.add_argument("--clients", type=int, default=8, help="concurrent connections (serve case)")
+    parser.add_argument("--requests", type=int, default=5000, help="total requests (serve case)")
+    parser.add_argument("--queries", type=int, default=200, help="distinct queries (serve case)")
+    args = parser.parse_args()
+    CASES[args.case](args)
+
+
+if __name__ == "__main__":
+    main()
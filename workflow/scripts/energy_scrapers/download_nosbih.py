@@ -1,11 +1,12 @@
 # energy_scrapers/download_nosbih.py
+import json
 import os
-import yaml
+import bs4
 import pandas as pd
-from datetime import datetime, timedelta
-from tqdm import tqdm
-import requests
+from datetime import date
 from bs4 import BeautifulSoup
+from energy_scrapers.framework import Request, Source, load_config, run_source
+from energy_scrapers.memo import parser_version
 
 
 def _col_index(header_cells, th_id: str) -> int | None:
@@ -38,119 +39,139 @@ def _replace_flat_stretches(actual: list[float | None],
     return final
 
 
-def run(overwrite: bool = False) -> None:
-    # ------------------------------------------------------------------ #
-    cfg_path = os.path.join(os.path.dirname(__file__), "..", "config.yaml")
-    with open(cfg_path, encoding="utf-8") as fp:
-        cfg = yaml.safe_load(fp)
+def _num(cell):
+    txt = cell.text.strip().replace(",", ".")
+    return float(txt) if txt else None
 
-    START   = datetime.strptime(cfg["START_DATE"], "%Y-%m-%d")
-    END     = datetime.strptime(cfg["END_DATE"], "%Y-%m-%d")
-    OUTDIR  = cfg["OUTPUT_DIR"]
-    os.makedirs(OUTDIR, exist_ok=True)
 
-    url     = "https://www.nosbih.ba/en/wp-admin/admin-ajax.php"
-    headers = {"User-Agent": "Mozilla/5.0", "X-Requested-With": "XMLHttpRequest"}
+def parse_production(html: str) -> dict:
+    """Production table → {"generation": [24], "demand": [24]} (gap‑filled)."""
+    soup = BeautifulSoup(html, "html.parser")
+    header_cells = soup.select("table#productionTable thead tr th")
+    body_rows    = soup.select("table#productionTable tbody tr")
+    if not header_cells or not body_rows:
+        raise ValueError("malformed table")
 
-    all_rows: list[dict] = []
-    for day in tqdm([START + timedelta(d) for d in range((END - START).days + 1)],
-                    desc="NOSBiH", unit="day"):
+    # map column indices
+    idx_actual  = _col_index(header_cells, "label-consumption-actual")
+    idx_planned = _col_index(header_cells, "label-consumption-planned")
+    idx_gen     = _col_index(header_cells, "label-production-hydropower") or 2
+    if idx_actual is None or idx_planned is None:
+        raise ValueError("header IDs not found")
 
-        if day.month == 2 and day.day == 29:   # site has no leap-day data
-            continue
+    # pre-allocate 24-slot holders
+    actual_vals  = [None] * 24
+    planned_vals = [None] * 24
+    gen_vals     = [None] * 24
 
-        date_str     = day.strftime("%d.%m.%Y.")
-        display_date = day.strftime("%Y-%m-%d")
+    for r in body_rows:
+        cols = r.find_all("td")
+        if len(cols) <= max(idx_actual, idx_planned, idx_gen):
+            continue
+        hour_txt = cols[0].text.strip()      # e.g. '01:00'
         try:
-            resp = requests.post(
-                url,
-                data={"action": "production", "production": f"date={date_str}"},
-                headers=headers,
-                timeout=15,
-            )
-            resp.raise_for_status()
-        except Exception as exc:
-            print(f"⚠️  {display_date}: fetch failed – {exc}")
+            hour_idx = int(hour_txt.split(":")[0]) - 1  # 0-based
+        except ValueError:
             continue
 
-        html = resp.json().get("data", "")
-        soup = BeautifulSoup(html, "html.parser")
-        header_cells = soup.select("table#productionTable thead tr th")
-        body_rows    = soup.select("table#productionTable tbody tr")
-        if not header_cells or not body_rows:
-            print(f"⚠️  {display_date}: malformed table")
-            continue
+        gen_vals[hour_idx]     = _num(cols[idx_gen])
+        actual_vals[hour_idx]  = _num(cols[idx_actual])
+        planned_vals[hour_idx] = _num(cols[idx_planned])
 
-        # map column indices
-        idx_actual  = _col_index(header_cells, "label-consumption-actual")
-        idx_planned = _col_index(header_cells, "label-consumption-planned")
-        idx_gen     = _col_index(header_cells, "label-production-hydropower") or 2
-        if idx_actual is None or idx_planned is None:
-            print(f"⚠️  {display_date}: header IDs not found")
-            continue
+    # 1) replace None / 0 with planned
+    final_demand = [
+        p if (a in (None, 0)) and (p not in (None, 0)) else a
+        for a, p in zip(actual_vals, planned_vals)
+    ]
+    # 2) replace flat stretches
+    final_demand = _replace_flat_stretches(final_demand, planned_vals)
+    return {"generation": gen_vals, "demand": final_demand}
+
+
+class NosbihSource(Source):
+    """One AJAX POST (`date=dd.mm.yyyy.`) per day."""
+
+    name    = "nosbih"
+    desc    = "NOSBiH"
+    timeout = 15
+
+    base_url = "https://www.nosbih.ba/en/wp-admin/admin-ajax.php"
+    headers  = {"User-Agent": "Mozilla/5.0", "X-Requested-With": "XMLHttpRequest"}
+    outputs  = ("nosbih_demand.csv", "nosbih_generation.csv")
 
-        # pre-allocate 24-slot holders
-        actual_vals  = [None] * 24
-        planned_vals = [None] * 24
-        gen_vals     = [None] * 24
-
-        for r in body_rows:
-            cols = r.find_all("td")
-            if len(cols) <= max(idx_actual, idx_planned, idx_gen):
-                continue
-            hour_txt = cols[0].text.strip()      # e.g. '01:00'
-            try:
-                hour_idx = int(hour_txt.split(":")[0]) - 1  # 0-based
-            except ValueError:
-                continue
-
-            def _num(cell):
-                txt = cell.text.strip().replace(",", ".")
-                return float(txt) if txt else None
-
-            gen_vals[hour_idx]     = _num(cols[idx_gen])
-            actual_vals[hour_idx]  = _num(cols[idx_actual])
-            planned_vals[hour_idx] = _num(cols[idx_planned])
-
-        # 1) replace None / 0 with planned
-        final_demand = [
-            p if (a in (None, 0)) and (p not in (None, 0)) else a
-            for a, p in zip(actual_vals, planned_vals)
+    def __init__(self, cfg: dict, *args, **kwargs) -> None:
+        super().__init__(cfg, *args, **kwargs)
+        self.workers = 1                      # the AJAX endpoint is polled day by day
+
+    def candidates(self) -> list[date]:
+        # site has no leap-day data
+        return [d for d in super().candidates() if not (d.month == 2 and d.day == 29)]
+
+    def requests(self, day: date) -> list[Request]:
+        date_str = day.strftime("%d.%m.%Y.")
+        return [Request(self.base_url, "POST",
+                        {"action": "production", "production": f"date={date_str}"},
+                        self.headers)]
+
+    def fetch(self, req, session):
+        payload = super().fetch(req, session)
+        if payload is None:
+            raise IOError("fetch failed – HTTP error")
+        return payload
+
+    def parse(self, view: memoryview) -> dict:
+        return parse_production(json.loads(bytes(view)).get("data", ""))
+
+    def rows(self, day: date, parsed: dict) -> list[dict]:
+        display_date = day.strftime("%Y-%m-%d")
+        return [
+            {
+                "date": display_date,
+                "hour": h + 1,
+                "power_generation": parsed["generation"][h],
+                "demand": parsed["demand"][h],
+            }
+            for h in range(24)
         ]
-        # 2) replace flat stretches
-        final_demand = _replace_flat_stretches(final_demand, planned_vals)
-
-        # append to the master list
-        for h in range(24):
-            all_rows.append(
-                {
-                    "date": display_date,
-                    "hour": h + 1,
-                    "power_generation": gen_vals[h],
-                    "demand": final_demand[h],
-                }
-            )
-
-    # ------------------------------------------------------------------ #
-    # Build dataframe and convert to "datetime" instead of separate date/hour
-    df = pd.DataFrame(all_rows)
-    df["datetime"] = pd.to_datetime(df["date"]) + pd.to_timedelta(df["hour"] - 1, unit="h")
-
-    # Output 1: demand only
-    demand_df = df[["datetime", "demand"]].dropna(subset=["demand"]).sort_values("datetime")
-    demand_csv = os.path.join(OUTDIR, "nosbih_demand.csv")
-    demand_df.to_csv(demand_csv, index=False, na_rep="")
-
-    # Output 2: power generation only
-    gen_df = df[["datetime", "power_generation"]].dropna(subset=["power_generation"]).sort_values("datetime")
-    gen_csv = os.path.join(OUTDIR, "nosbih_generation.csv")
-    gen_df.to_csv(gen_csv, index=False, na_rep="")
-
-    # ------------------------------------------------------------------ #
-    print(
-        f"✅ NOSBiH data saved – Demand: {demand_csv} ({demand_df['datetime'].nunique()} hours, {demand_df['demand'].count()} values), "
-        f"Generation: {gen_csv} ({gen_df['datetime'].nunique()} hours, {gen_df['power_generation'].count()} values)"
-    )
+
+    def warn(self, day, req, exc) -> None:
+        print(f"⚠️  {day:%Y-%m-%d}: {exc}")
+
+    def frames(self, results) -> dict:
+        # Build dataframe and convert to "datetime" instead of separate date/hour
+        all_rows = [r for _, rows in results for r in rows or []]
+        df = pd.DataFrame(all_rows, columns=["date", "hour", "power_generation", "demand"])
+        df["datetime"] = pd.to_datetime(df["date"]) + pd.to_timedelta(df["hour"] - 1, unit="h")
+        return {
+            # Output 1: demand only
+            "nosbih_demand.csv":
+                df[["datetime", "demand"]].dropna(subset=["demand"]).sort_values("datetime"),
+            # Output 2: power generation only
+            "nosbih_generation.csv":
+                df[["datetime", "power_generation"]].dropna(subset=["power_generation"]).sort_values("datetime"),
+        }
+
+    def emit(self, results) -> None:
+        frames     = super().emit(results)
+        demand_df  = frames["nosbih_demand.csv"]
+        gen_df     = frames["nosbih_generation.csv"]
+        demand_csv = os.path.join(self.out_dir, "nosbih_demand.csv")
+        gen_csv    = os.path.join(self.out_dir, "nosbih_generation.csv")
+
+        # ------------------------------------------------------------------ #
+        print(
+            f"✅ NOSBiH data saved – Demand: {demand_csv} ({demand_df['datetime'].nunique()} hours, {demand_df['demand'].count()} values), "
+            f"Generation: {gen_csv} ({gen_df['datetime'].nunique()} hours, {gen_df['power_generation'].count()} values)"
+        )
+
+
+# bump automatically whenever the table parser or BeautifulSoup changes
+NosbihSource.version = parser_version(NosbihSource.parse, _col_index, _replace_flat_stretches, _num,
+                                      parse_production, f"bs4 {bs4.__version__}")
+
+
+def run(overwrite: bool = False) -> None:
+    run_source(NosbihSource(load_config()))
 
 
 if __name__ == "__main__":
@@ -8,20 +8,23 @@ Download hourly demand data from OST (Albanian TSO).
   '', -1, -2, -3, -4, -001, -002, -003
   to catch files like “…14.04.2025-002.xlsx”.
 • Uses cell C158 of each workbook to determine the *true* reporting date.
-• Concurrency: one thread per candidate file (keep-alive session).
+• Concurrency: pipelined fetch/parse pools from `framework.py` (keep-alive
+  session per thread).
+• Workbooks are streamed into spooled payloads (see payload.py) so 32
+  workers do not each hold a full in-memory copy.
+• Parsed workbooks are memoised by content hash (see memo.py).
 • Outputs a dense CSV; missing demand values remain blank.
 """
 
 import os
-import yaml
-import requests
+import openpyxl
 import pandas as pd
-from io import BytesIO
-from datetime import datetime
+from datetime import date, datetime
 from dateutil.relativedelta import relativedelta
 from openpyxl import load_workbook
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from tqdm import tqdm
+from energy_scrapers.framework import Request, Source, dense_grid, load_config, run_source
+from energy_scrapers.payload import reader
+from energy_scrapers.memo import parser_version
 import warnings
 
 warnings.filterwarnings("ignore", category=UserWarning, module="openpyxl")
@@ -43,10 +46,11 @@ def _find_sheet(wb):
     raise KeyError("'Publikime AL' sheet not found")
 
 
-def _date_from_c158(xlsx: bytes):
+def _date_from_c158(xlsx: bytes | memoryview):
     try:
-        wb = load_workbook(BytesIO(xlsx), read_only=True, data_only=True)
+        wb = load_workbook(reader(xlsx), read_only=True, data_only=True)
         value = _find_sheet(wb)["C158"].value
+        wb.close()
         if isinstance(value, str):
             return datetime.strptime(value.strip(), "%d.%m.%Y").date()
         if isinstance(value, datetime):
@@ -58,101 +62,105 @@ def _date_from_c158(xlsx: bytes):
     return None
 
 
-def _hourly_rows(xlsx: bytes, rep_date):
-    wb = load_workbook(BytesIO(xlsx), read_only=True, data_only=True)
+def _hourly_rows(xlsx: bytes | memoryview, rep_date):
+    wb = load_workbook(reader(xlsx), read_only=True, data_only=True)
     vals = [_find_sheet(wb)[f"F{row}"].value for row in range(160, 184)]
+    wb.close()
     return [
         {"date": rep_date.isoformat(), "hour": h + 1, "demand": v}
         for h, v in enumerate(vals) if v is not None
     ]
 
 
+def _read_workbook(xlsx: bytes | memoryview):
+    """Return [reporting date (ISO), hourly rows] or None – JSON friendly."""
+    rep = _date_from_c158(xlsx)
+    return [rep.isoformat(), _hourly_rows(xlsx, rep)] if rep else None
+
+
 # ─────────────────────────────────────────────────────────────────────────── #
-def run(overwrite=False):
-    # 1. read config --------------------------------------------------------- #
-    cfg_file = os.path.join(os.path.dirname(__file__), "..", "config.yaml")
-    with open(cfg_file, encoding="utf-8") as f:
-        cfg = yaml.safe_load(f)
-
-    start = datetime.strptime(cfg["START_DATE"], "%Y-%m-%d")
-    end   = datetime.strptime(cfg["END_DATE"],   "%Y-%m-%d")
-    out_dir = cfg["OUTPUT_DIR"]
-    max_workers = int(cfg.get("MAX_WORKERS", DEFAULT_WORKERS))
-    os.makedirs(out_dir, exist_ok=True)
-
-    wanted_days = pd.date_range(start, end).date
-    search_days = pd.date_range(start, end + relativedelta(months=1)).date
-
-    # 2. worker (one *candidate date* per thread) ---------------------------- #
-    def fetch(day):
-        sess = requests.Session()  # keep-alive inside the thread
+class OstSource(Source):
+    """One task per *candidate filename date*; C158 gives the true date."""
+
+    name            = "ost"
+    desc            = "OST"
+    unit            = "file"
+    default_workers = DEFAULT_WORKERS
+    timeout         = HTTP_TIMEOUT
+    progress        = not VERBOSE
+    base_url        = BASE_URL
+    outputs         = ("ost_data.csv",)
+
+    # 1. candidates: look one month past END_DATE ---------------------------- #
+    def candidates(self) -> list[date]:
+        return list(pd.date_range(self.start, self.end + relativedelta(months=1)).date)
+
+    def watch_candidates(self) -> list[date]:
+        return super().candidates()   # same-day files carry their own date
+
+    # 2. every suffix × month folder for one filename date ------------------- #
+    def requests(self, day: date) -> list[Request]:
+        reqs = []
         for suf in SUFFIXES:
             for off in FOLDERS:
                 folder = datetime(day.year, day.month, 1) + relativedelta(months=off)
-                url = (
-                    f"{BASE_URL}/{folder.year}/{folder.month:02d}/"
+                reqs.append(Request(
+                    f"{self.base_url}/{folder.year}/{folder.month:02d}/"
                     f"Publikimi-te-dhenave-{day.day:02d}.{day.month:02d}.{day.year}{suf}.xlsx"
-                )
-                try:
-                    r = sess.get(url, timeout=HTTP_TIMEOUT)
-                    if r.status_code != 200:
-                        continue
-                    rep = _date_from_c158(r.content)
-                    if not rep or not (start.date() <= rep <= end.date()):
-                        continue          # outside desired window
-                    rows = _hourly_rows(r.content, rep)
-                    if rows:
-                        return rep, rows  # success – stop searching
-                except Exception as exc:
-                    if VERBOSE:
-                        print("⚠", url, exc)
-        return None                     # nothing useful for this *filename*
-
-    # 3. concurrent execution ----------------------------------------------- #
-    bar = tqdm(total=len(search_days), desc="OST", unit="file",
-               dynamic_ncols=True, disable=VERBOSE)
-
-    collected = {}   # rep_date → rows (keep longest if duplicates)
-
-    with ThreadPoolExecutor(max_workers=max_workers) as pool:
-        for fut in as_completed(pool.submit(fetch, d) for d in search_days):
-            bar.update(1)
-            res = fut.result()
-            if res:
-                rep, rows = res
+                ))
+        return reqs
+
+    def parse(self, view: memoryview):
+        return _read_workbook(view)
+
+    def rows(self, day: date, parsed) -> list[dict] | None:
+        rep = datetime.strptime(parsed[0], "%Y-%m-%d").date()
+        if not (self.start <= rep <= self.end):
+            return None           # outside desired window
+        return parsed[1] or None
+
+    def warn(self, day, req, exc) -> None:
+        if VERBOSE:
+            print("⚠", req.url if req else day, exc)
+
+    # 3. keep the longest workbook per reporting date, then dense CSV -------- #
+    @staticmethod
+    def _collect(results) -> dict:
+        collected = {}   # rep_date → rows (keep longest if duplicates)
+        for _, rows in results:
+            if rows:
+                rep = rows[0]["date"]
                 if rep not in collected or len(rows) > len(collected[rep]):
                     collected[rep] = rows
-    bar.close()
-
-    # 4. build full (date, hour) skeleton ------------------------------------ #
-    skeleton = pd.MultiIndex.from_product(
-        [pd.Series(wanted_days).astype(str), range(1, 25)],
-        names=["date", "hour"]
-    ).to_frame(index=False)
-
-    real_rows = pd.DataFrame(
-        [r for lst in collected.values() for r in lst],
-        columns=["date", "hour", "demand"]
-    )
-
-    df = (
-        skeleton
-        .merge(real_rows, how="left", on=["date", "hour"])
-        .sort_values(["date", "hour"])
-    )
-
-    # 5. save CSV ------------------------------------------------------------ #
-    csv_path = os.path.join(out_dir, "ost_data.csv")
-    df.to_csv(csv_path, index=False, na_rep="")
-    print(f"✅ Saved {len(df):,} rows ({df['date'].nunique()} day(s)) → {csv_path}")
-
-    missing = sorted(set(wanted_days) - set(pd.to_datetime(real_rows["date"]).dt.date))
-    if missing:
-        print(
-            "\n⚠ No workbook found for:",
-            ", ".join(d.isoformat() for d in missing),
-            "\n   (looked one month ahead)",
-        )
+        return collected
+
+    def frames(self, results) -> dict:
+        real_rows = [r for lst in self._collect(results).values() for r in lst]
+        return {"ost_data.csv": dense_grid(self.start, self.end, real_rows, ["date", "hour", "demand"])}
+
+    def emit(self, results) -> None:
+        df       = super().emit(results)["ost_data.csv"]
+        csv_path = os.path.join(self.out_dir, "ost_data.csv")
+        print(f"✅ Saved {len(df):,} rows ({df['date'].nunique()} day(s)) → {csv_path}")
+
+        found   = {datetime.strptime(d, "%Y-%m-%d").date() for d in self._collect(results)}
+        missing = [d for d in pd.date_range(self.start, self.end).date if d not in found]
+        if missing:
+            print(
+                "\n⚠ No workbook found for:",
+                ", ".join(d.isoformat() for d in missing),
+                "\n   (looked one month ahead)",
+            )
+
+
+# bump automatically whenever the cell reader or openpyxl changes
+PARSER_VERSION = OstSource.version = parser_version(
+    OstSource.parse, _find_sheet, _date_from_c158, _hourly_rows, _read_workbook,
+    f"openpyxl {openpyxl.__version__}")
+
+# ─────────────────────────────────────────────────────────────────────────── #
+def run(overwrite=False):
+    run_source(OstSource(load_config()))
 
 
 # ─────────────────────────────────────────────────────────────────────────── #
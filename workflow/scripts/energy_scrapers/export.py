@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+PyPSA / OSeMOSYS demand export
+==============================
+Turns the scraped demand series into model inputs for the `models/`
+submodules, reading every output once:
+
+* `pypsa/electricity_demand.csv` – hourly load [MW] per WB6 country on a
+  UTC index (the layout of pypsa‑eur's `electricity_demand.csv`).
+* `osemosys/SpecifiedDemandProfile.csv`, `YearSplit.csv`,
+  `SpecifiedAnnualDemand.csv` – otoole‑style tables for the timeslices
+  defined in config.yaml (`EXPORT: SEASONS × DAYPARTS`, local clock of
+  `EXPORT: TIMEZONE`).  Fuels follow osemosys_global (`ELC<ISO3>XX02`).
+
+Every hour gets a timeslice code in one vectorised pass and the
+per‑(year, timeslice) sums are `np.bincount`s.  A timeslice's energy is its
+mean observed load × its calendar hours, so gaps do not skew the profile.
+Years with an unobserved timeslice are skipped.  If that leaves a country
+with no year at all (any sub‑year window), the OSeMOSYS tables are not
+written – stale ones are removed – while the PyPSA load is always written.
+
+Outputs are rebuilt only when an input CSV's content, the export settings
+or this module's code change (fingerprint in `.export_manifest.json`,
+together with the status of each output group).
+"""
+from __future__ import annotations
+import hashlib, json, os, sys, numpy as np, pandas as pd
+from energy_scrapers.framework import load_config
+from energy_scrapers.memo import parser_version
+from energy_scrapers import panel
+
+MANIFEST  = ".export_manifest.json"
+PYPSA_LOAD = os.path.join("pypsa", "electricity_demand.csv")
+OSEMOSYS_TABLES = tuple(os.path.join("osemosys", f"{t}.csv")
+                        for t in ("SpecifiedDemandProfile", "YearSplit", "SpecifiedAnnualDemand"))
+GROUPS    = {"pypsa": (PYPSA_LOAD,), "osemosys": OSEMOSYS_TABLES}
+WRITTEN   = "written"
+MWH_TO_PJ = 3.6e-6
+ISO3      = {"AL": "ALB", "BA": "BIH", "ME": "MNE", "MK": "MKD", "RS": "SRB", "XK": "XKX"}
+
+DEFAULTS = {
+    "DIR":      None,                 # → OUTPUT_DIR/export
+    "REGION":   "GLOBAL",
+    "TIMEZONE": "Europe/Belgrade",    # one clock for all WB6 countries (CET/CEST)
+    "SEASONS":  {"S1": [12, 1, 2], "S2": [3, 4, 5], "S3": [6, 7, 8], "S4": [9, 10, 11]},
+    "DAYPARTS": {"D1": [0, 6], "D2": [6, 12], "D3": [12, 18], "D4": [18, 24]},   # [from, to) hour
+}
+
+# ───────────── timeslices ───────────────────────────────────────────────
+
+def timeslices(index: pd.DatetimeIndex, seasons: dict, dayparts: dict,
+               tz: str) -> tuple[np.ndarray, np.ndarray, list[str]]:
+    """Local year and timeslice code of every hour in *index*, plus code → name."""
+    season_of = np.full(13, -1)
+    for k, months in enumerate(seasons.values()):
+        season_of[months] = k
+    part_of = np.full(24, -1)
+    for k, (lo, hi) in enumerate(dayparts.values()):
+        part_of[lo:hi] = k
+    if (season_of[1:] < 0).any() or (part_of < 0).any():
+        raise ValueError("EXPORT SEASONS must cover every month and DAYPARTS every hour")
+
+    local = index.tz_convert(tz)
+    code  = season_of[local.month.to_numpy()] * len(dayparts) + part_of[local.hour.to_numpy()]
+    names = [s + d for s in seasons for d in dayparts]
+    return local.year.to_numpy(), code, names
+
+# ───────────── exporters ────────────────────────────────────────────────
+
+def pypsa_load(demand: pd.DataFrame) -> pd.DataFrame:
+    """Hourly UTC load [MW], one column per country, gaps left blank."""
+    out = demand.copy()
+    out.index.name = "utc_timestamp"
+    out.columns.name = None
+    return out
+
+
+def osemosys_tables(demand: pd.DataFrame, opts: dict) -> dict[str, pd.DataFrame]:
+    """SpecifiedDemandProfile / YearSplit / SpecifiedAnnualDemand for *demand*."""
+    seasons, dayparts, tz = opts["SEASONS"], opts["DAYPARTS"], opts["TIMEZONE"]
+    years, code, names    = timeslices(demand.index, seasons, dayparts, tz)
+    n_ts = len(names)
+    if not len(years):
+        raise ValueError("no demand data to export")
+    y0, n_years = years.min(), years.max() - years.min() + 1
+    key = (years - y0) * n_ts + code
+
+    # calendar hours per (year, timeslice), whether observed or not
+    cal = pd.date_range(pd.Timestamp(f"{y0}-01-01", tz=tz), pd.Timestamp(f"{y0 + n_years}-01-01", tz=tz),
+                        freq="h", inclusive="left")
+    cal_years, cal_code, _ = timeslices(cal, seasons, dayparts, tz)
+    hours = np.bincount((cal_years - y0) * n_ts + cal_code, minlength=n_years * n_ts).reshape(n_years, n_ts)
+
+    profile, annual, incomplete = [], [], []
+    for country in demand.columns:
+        v    = demand[country].to_numpy(dtype="float64")
+        ok   = ~np.isnan(v)
+        sums = np.bincount(key[ok], v[ok], minlength=n_years * n_ts).reshape(n_years, n_ts)
+        cnt  = np.bincount(key[ok], minlength=n_years * n_ts).reshape(n_years, n_ts)
+        fuel = f"ELC{ISO3.get(country, country)}XX02"
+        for y in np.flatnonzero(cnt.any(axis=1)):
+            if not cnt[y].all():
+                print(f"⚠️  {country} {y0 + y}: {int((cnt[y] == 0).sum())} timeslice(s) without data – year skipped")
+                continue
+            energy = sums[y] / cnt[y] * hours[y]                      # MWh per timeslice
+            for ts, share in zip(names, energy / energy.sum()):
+                profile.append((opts["REGION"], fuel, ts, int(y0 + y), share))
+            annual.append((opts["REGION"], fuel, int(y0 + y), energy.sum() * MWH_TO_PJ))
+        if not annual or annual[-1][1] != fuel:
+            incomplete.append(country)
+    if incomplete:
+        raise ValueError(f"no year with every timeslice observed for {', '.join(incomplete)} – "
+                         "widen START_DATE/END_DATE to whole years or coarsen EXPORT SEASONS/DAYPARTS")
+
+    split = [(ts, int(y0 + y), h / hours[y].sum())
+             for y in range(n_years) for ts, h in zip(names, hours[y])]
+    return dict(zip(OSEMOSYS_TABLES, (
+        pd.DataFrame(profile, columns=["REGION", "FUEL", "TIMESLICE", "YEAR", "VALUE"]),
+        pd.DataFrame(split,   columns=["TIMESLICE", "YEAR", "VALUE"]),
+        pd.DataFrame(annual,  columns=["REGION", "FUEL", "YEAR", "VALUE"]),
+    )))
+
+# bump automatically whenever the export logic changes
+EXPORT_VERSION = parser_version(timeslices, pypsa_load, osemosys_tables, panel._load,
+                                panel.local_hours_to_utc, panel.build_panel, MWH_TO_PJ, ISO3)
+
+# ───────────── cache ────────────────────────────────────────────────────
+
+def _stat(path: str) -> list[int] | None:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+def _load_manifest(path: str) -> dict:
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as fp:
+            return json.load(fp)
+    return {}
+
+
+def _save_manifest(path: str, manifest: dict) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + ".tmp", "w", encoding="utf-8") as fp:
+        json.dump(manifest, fp, indent=1, sort_keys=True)
+    os.replace(path + ".tmp", path)
+
+
+def _current(exp_dir: str, status: dict) -> bool:
+    """Files on disk match the recorded per‑group status."""
+    return set(status) == set(GROUPS) and all(
+        os.path.exists(os.path.join(exp_dir, o)) == (status[g] == WRITTEN)
+        for g, outs in GROUPS.items() for o in outs)
+
+
+def export(out_dir: str, opts: dict, overwrite: bool = False) -> tuple[bool, dict[str, str]]:
+    """
+    (Re)build the model inputs in ``opts["DIR"]``.  Returns ``(built, status)``
+    with *status* mapping each output group to ``"written"`` or the reason it
+    was skipped; *built* is False when the cached outputs were still current.
+    """
+    sources  = [s for s in panel.SOURCES if "demand" in s[4]]
+    exp_dir  = opts["DIR"]
+    man_path = os.path.join(exp_dir, MANIFEST)
+    manifest = _load_manifest(man_path)
+    status   = manifest.get("outputs", {})
+    settings = hashlib.sha256(json.dumps([EXPORT_VERSION, {k: opts[k] for k in DEFAULTS if k != "DIR"}],
+                                         sort_keys=True).encode()).hexdigest()
+    stats    = {s[0]: _stat(os.path.join(out_dir, s[0])) for s in sources}
+    cached   = not overwrite and manifest.get("settings") == settings and _current(exp_dir, status)
+    if cached and manifest.get("stats") == stats:
+        return False, status                                  # nothing touched since last build
+
+    # read every input exactly once; the bytes feed both the hash and the parser
+    files = {}
+    for fname in stats:
+        if stats[fname] is not None:
+            with open(os.path.join(out_dir, fname), "rb") as fp:
+                files[fname] = fp.read()
+    if not files:
+        raise ValueError(f"no demand outputs in {out_dir} – run the scrapers first")
+    digests = {f: hashlib.sha256(b).hexdigest() for f, b in files.items()}
+    if cached and manifest.get("inputs") == digests:
+        manifest["stats"] = stats                             # rewritten, same content
+        _save_manifest(man_path, manifest)
+        for g, outs in GROUPS.items():                        # keep make/snakemake from retrying
+            for o in outs if status[g] == WRITTEN else ():
+                os.utime(os.path.join(exp_dir, o))
+        return False, status
+
+    demand = panel.build_panel(out_dir, sources, files).xs("demand", axis=1, level="variable")
+    tables = {PYPSA_LOAD: pypsa_load(demand)}
+    status = {"pypsa": WRITTEN}
+    try:
+        tables.update(osemosys_tables(demand, opts))
+        status["osemosys"] = WRITTEN
+    except ValueError as exc:                                 # sub‑year window: no profiles
+        status["osemosys"] = f"skipped – {exc}"
+        for o in OSEMOSYS_TABLES:                             # never leave stale tables behind
+            if os.path.exists(os.path.join(exp_dir, o)):
+                os.remove(os.path.join(exp_dir, o))
+    for rel, df in tables.items():
+        path = os.path.join(exp_dir, rel)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        df.to_csv(path, index=rel == PYPSA_LOAD, na_rep="")
+    _save_manifest(man_path, {"settings": settings, "inputs": digests, "stats": stats, "outputs": status})
+    return True, status
+
+
+# ───────────── main entry ───────────────────────────────────────────────
+
+def run(overwrite: bool = False) -> None:
+    cfg  = load_config()
+    opts = {**DEFAULTS, **(cfg.get("EXPORT") or {})}
+    opts["DIR"] = opts["DIR"] or os.path.join(cfg["OUTPUT_DIR"], "export")
+    try:
+        built, status = export(cfg["OUTPUT_DIR"], opts, overwrite)
+    except ValueError as exc:                     # nothing to export at all
+        sys.exit(f"❌ export failed: {exc}")
+    for group, state in status.items():
+        if state != WRITTEN:
+            print(f"⚠️  {group} inputs {state}")
+        elif built:
+            print(f"✅ {group} inputs written to {opts['DIR']}")
+        else:
+            print(f"✅ {group} inputs in {opts['DIR']} are up to date")
+
+if __name__ == "__main__":
+    run()
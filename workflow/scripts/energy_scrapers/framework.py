@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pipelined scraper framework
+===========================
+Every TSO source is modelled as four stages
+
+    discover → fetch → parse → emit
+
+* **discover** – `Source.candidates()` lists the tasks (usually days).
+* **fetch**    – `Source.requests(task)` lists URL variants; the framework
+  streams the first HTTP‑200 body into a spooled payload (payload.py).
+* **parse**    – `Source.parse(view)` turns the body into a JSON‑friendly
+  result (memoised by content hash, memo.py); `Source.rows(task, parsed)`
+  turns that into output rows.  A falsy result sends the task back to the
+  fetch stage with the *next* URL variant.
+* **emit**     – `Source.frames(results)` shapes the output tables;
+  `Source.emit` writes them whole, `Source.append` merges them day by day
+  into existing outputs (watch mode).
+
+:func:`run_pipeline` runs fetch and parse on separate thread pools; at most
+`2 × workers` tasks are in flight at once, so discovery blocks (backpressure)
+instead of queuing the whole window.  Results come back in task order, so
+outputs do not depend on thread scheduling.
+"""
+from __future__ import annotations
+import logging, os, queue, threading, yaml, requests, pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from typing import Any, NamedTuple
+from tqdm import tqdm
+from energy_scrapers.payload import NotModified, Payload, download
+from energy_scrapers.memo import ParseMemo, open_memo
+
+CONFIG_FILE = os.path.join(os.path.dirname(__file__), "..", "config.yaml")
+
+# ───────────── config & calendar helpers ────────────────────────────────
+
+def load_config(path: str = CONFIG_FILE) -> dict:
+    with open(path, encoding="utf-8") as fp:
+        return yaml.safe_load(fp)
+
+
+def to_date(value: str | date) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+def day_range(start: date, end: date) -> list[date]:
+    return [start + timedelta(days=i) for i in range((end - start).days + 1)]
+
+
+def dense_grid(start: date, end: date, rows: list[dict], columns: list[str]) -> pd.DataFrame:
+    """Left‑join *rows* onto the full (date, hour) skeleton so gaps stay blank."""
+    skel = pd.MultiIndex.from_product(
+        [pd.date_range(start, end).strftime("%Y-%m-%d"), range(1, 25)],
+        names=["date", "hour"],
+    ).to_frame(index=False)
+    real = pd.DataFrame(rows, columns=columns)
+    return skel.merge(real, how="left", on=["date", "hour"]).sort_values(["date", "hour"])
+
+# ───────────── source base class ────────────────────────────────────────
+
+class Request(NamedTuple):
+    url: str
+    method: str = "GET"
+    data: dict | None = None
+    headers: dict | None = None
+
+
+class Source:
+    """Base class: subclasses supply URL logic, a parser and an emitter."""
+
+    name            = ""       # memo key + log prefix
+    desc: str | None = None    # progress bar label
+    unit            = "day"
+    progress        = True     # show a tqdm bar
+    default_workers = 10       # used if MAX_WORKERS missing in config.yaml
+    timeout: float  = 10       # seconds per request
+    version         = ""       # parser version (see memo.parser_version)
+    base_url        = ""       # overridable via BASE_URLS[<url_key>] in config.yaml
+    url_key: str | None = None # defaults to `name`
+    outputs: tuple[str, ...] = ()   # CSVs in OUTPUT_DIR; outputs[0] tracks progress
+
+    def __init__(self, cfg: dict, start: date | None = None, end: date | None = None) -> None:
+        self.cfg     = cfg
+        self.start   = to_date(start or cfg["START_DATE"])
+        self.end     = to_date(end or cfg["END_DATE"])
+        self.out_dir = cfg["OUTPUT_DIR"]
+        self.workers = int(cfg.get("MAX_WORKERS", self.default_workers))
+        self.base_url = (cfg.get("BASE_URLS") or {}).get(self.url_key or self.name, self.base_url)
+        # url → {"ETag": …, "Last-Modified": …}; set to a dict to send conditional GETs
+        self.validators: dict[str, dict[str, str]] | None = None
+
+    # ── discover ──
+    def candidates(self) -> list:
+        return day_range(self.start, self.end)
+
+    def watch_candidates(self) -> list:
+        """Tasks to poll when watching for new days (default: same as batch)."""
+        return self.candidates()
+
+    # ── fetch ──
+    def requests(self, task) -> list[Request]:
+        raise NotImplementedError
+
+    def fetch(self, req: Request, session: requests.Session) -> Payload | None:
+        headers = req.headers
+        known   = self.validators.get(req.url) if self.validators is not None and req.method == "GET" else None
+        if known:
+            headers = {**(headers or {})}
+            if "ETag" in known:
+                headers["If-None-Match"] = known["ETag"]
+            if "Last-Modified" in known:
+                headers["If-Modified-Since"] = known["Last-Modified"]
+        payload = download(req.url, session=session, method=req.method, timeout=self.timeout,
+                           data=req.data, headers=headers)
+        if payload is not None and self.validators is not None and payload.validators:
+            self.validators[req.url] = payload.validators
+        return payload
+
+    # ── parse ──
+    def parse(self, view: memoryview) -> Any:
+        """Content‑only parse of one body → JSON‑friendly result or None."""
+        raise NotImplementedError
+
+    def rows(self, task, parsed: Any) -> list[dict] | None:
+        """Attach task context (date, …) to a parsed result."""
+        raise NotImplementedError
+
+    def unparsed(self, task, payload: Payload) -> None:
+        """Called with the still‑open payload when nothing could be parsed."""
+
+    def warn(self, task, req: Request | None, exc: Exception) -> None:
+        logging.debug("%s error [%s]: %s", self.name.upper(), req.url if req else task, exc)
+
+    # ── emit ──
+    def frames(self, results: list[tuple[Any, list[dict] | None]]) -> dict[str, pd.DataFrame]:
+        """Output tables keyed by file name (first column = date/datetime)."""
+        raise NotImplementedError
+
+    def emit(self, results: list[tuple[Any, list[dict] | None]]) -> dict[str, pd.DataFrame]:
+        """Write every frame to OUTPUT_DIR; return them for reporting."""
+        frames = self.frames(results)
+        for fname, df in frames.items():
+            df.to_csv(os.path.join(self.out_dir, fname), index=False, na_rep="")
+        return frames
+
+    def append(self, results: list[tuple[Any, list[dict] | None]]) -> None:
+        """
+        Merge the days in *results* into the existing outputs: rows for the
+        days that came back with data are replaced, every other line is kept
+        byte for byte (dense‑grid filler for days in between is dropped).
+        """
+        days = {str(r["date"])[:10] for _, rows in results if rows for r in rows}
+        for fname, df in self.frames(results).items():
+            path  = os.path.join(self.out_dir, fname)
+            lines = df.to_csv(index=False, na_rep="").splitlines(keepends=True)
+            header, new = lines[0], [ln for ln in lines[1:] if ln[:10] in days]
+            if os.path.exists(path):
+                with open(path, encoding="utf-8", newline="") as fp:
+                    old = fp.readlines()
+                if old and old[0] != header:
+                    raise ValueError(f"{path}: columns differ from {self.name}'s output "
+                                     f"({old[0].strip()!r} vs {header.strip()!r}) – re‑run the batch scraper")
+                if old:
+                    new = [ln for ln in old[1:] if ln[:10] not in days] + new
+                    new.sort(key=lambda ln: ln[:10])           # stable: keeps hour order
+            tmp = path + ".tmp"
+            with open(tmp, "w", encoding="utf-8", newline="") as fp:
+                fp.writelines([header, *new])
+            os.replace(tmp, path)
+
+    def latest_day(self) -> date | None:
+        """Last day with at least one value in ``outputs[0]`` (None if absent)."""
+        path = os.path.join(self.out_dir, self.outputs[0])
+        if not os.path.exists(path):
+            return None
+        df   = pd.read_csv(path, dtype=str)
+        vals = df.drop(columns=[c for c in ("date", "hour", "datetime") if c in df.columns])
+        days = df.iloc[:, 0].str[:10][vals.notna().any(axis=1)]
+        return to_date(days.max()) if len(days) else None
+
+# ───────────── pipelined executor ───────────────────────────────────────
+
+def run_pipeline(source: Source, tasks: list, memo: ParseMemo | None = None,
+                 progress: bool | None = None) -> list[tuple[Any, list[dict] | None]]:
+    """Run *tasks* through fetch → parse; return ``[(task, rows | None)]`` in task order."""
+    memo    = memo or ParseMemo(None)
+    workers = max(1, source.workers)
+    slots   = threading.BoundedSemaphore(2 * workers)   # in‑flight cap = backpressure
+    done: queue.Queue = queue.Queue()
+    local   = threading.local()
+
+    fetch_pool = ThreadPoolExecutor(workers, thread_name_prefix=f"{source.name}-fetch")
+    parse_pool = ThreadPoolExecutor(min(workers, os.cpu_count() or 1), thread_name_prefix=f"{source.name}-parse")
+
+    def finish(i: int, rows: list[dict] | None) -> None:
+        done.put((i, rows))
+        slots.release()
+
+    def fetch(i: int, start_at: int) -> None:
+        task = tasks[i]
+        if not hasattr(local, "session"):
+            local.session = requests.Session()          # keep‑alive per thread
+        try:
+            reqs = source.requests(task)
+        except Exception as exc:
+            source.warn(task, None, exc)
+            return finish(i, None)
+        for j in range(start_at, len(reqs)):
+            try:
+                payload = source.fetch(reqs[j], local.session)
+            except NotModified:                          # this variant is the known, unchanged one
+                break
+            except Exception as exc:
+                source.warn(task, reqs[j], exc)
+                continue
+            if payload is not None:
+                parse_pool.submit(parse, i, reqs, j, payload)
+                return
+        finish(i, None)
+
+    def parse(i: int, reqs: list[Request], j: int, payload: Payload) -> None:
+        task, rows = tasks[i], None
+        try:
+            with payload:
+                parsed = memo.parse(payload.digest, source.name, source.version,
+                                    lambda: source.parse(payload.view))
+                if parsed:
+                    rows = source.rows(task, parsed)
+                else:
+                    source.unparsed(task, payload)
+        except Exception as exc:
+            source.warn(task, reqs[j], exc)
+        if rows:
+            finish(i, rows)
+            return
+        if source.validators is not None:              # only bodies that gave rows are revalidated
+            source.validators.pop(reqs[j].url, None)
+        if j + 1 < len(reqs):
+            fetch_pool.submit(fetch, i, j + 1)           # fall back to next variant
+        else:
+            finish(i, None)
+
+    def discover() -> None:
+        for i in range(len(tasks)):
+            slots.acquire()
+            fetch_pool.submit(fetch, i, 0)
+
+    threading.Thread(target=discover, name=f"{source.name}-discover", daemon=True).start()
+
+    results: list[list[dict] | None] = [None] * len(tasks)
+    with tqdm(total=len(tasks), desc=source.desc, unit=source.unit,
+              dynamic_ncols=True, disable=not (source.progress if progress is None else progress)) as bar:
+        for _ in range(len(tasks)):
+            i, rows = done.get()
+            results[i] = rows
+            bar.update(1)
+
+    fetch_pool.shutdown()
+    parse_pool.shutdown()
+    return list(zip(tasks, results))
+
+
+def run_source(source: Source) -> None:
+    """discover → fetch → parse → emit for one configured source."""
+    os.makedirs(source.out_dir, exist_ok=True)
+    memo = open_memo(source.cfg)
+    try:
+        results = run_pipeline(source, source.candidates(), memo)
+    finally:
+        memo.close()
+    source.emit(results)
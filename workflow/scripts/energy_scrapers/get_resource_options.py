@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+VRE resource options (wind + solar potential)
+=============================================
+Turns gridded hourly weather and land‑eligibility rasters into hourly
+capacity‑factor profiles and installable potentials per WB6 country and
+region, written to `store/`.
+
+Inputs (plain `.npy` rasters, opened memory‑mapped)
+---------------------------------------------------
+WEATHER_DIR/
+    time.npy         (T,)       datetime64, hourly UTC interval starts
+    lat.npy, lon.npy (Y,), (X,) cell centres in degrees (regular grid)
+    wnd100m.npy      (T, Y, X)  wind speed at 100 m [m/s]
+    influx.npy       (T, Y, X)  global horizontal irradiance [W/m²]
+    temperature.npy  (T, Y, X)  2 m air temperature [°C]
+ELIGIBILITY_DIR/
+    regions.npy      (Y, X)     int region code per cell, 0 = outside WB6
+    regions.json     {"<code>": {"country": "AL", "region": "…"}, …}
+    <tech>.npy       (Y, X)     eligible share of each cell in [0, 1]
+
+Model
+-----
+* onwind – 100 m speed scaled to hub height (power law, α = 1/7) and run
+  through a generic turbine power curve (`np.interp`).
+* solar  – horizontal GHI with a NOCT cell‑temperature derating and a
+  fixed performance ratio.
+* Every profile is the potential‑weighted mean over the eligible cells of a
+  zone (region or whole country); potential = eligible km² × MW/km².
+
+Only the eligible cells of one time chunk (`CHUNK_HOURS`) are ever copied
+out of the memory‑mapped rasters, so multi‑year, country‑scale grids run
+in a fixed amount of RAM; the zone aggregation is a single matrix product
+per chunk.
+
+    python -m energy_scrapers.get_resource_options        # uses config.yaml → VRE
+"""
+from __future__ import annotations
+import json, mmap, os, numpy as np, pandas as pd
+from energy_scrapers.framework import load_config
+
+PROFILES_FILE   = "vre_profiles.parquet"
+POTENTIALS_FILE = "vre_potentials.csv"
+WEATHER_FIELDS  = ("wnd100m", "influx", "temperature")
+EARTH_RADIUS_KM = 6371.0
+DEFAULT_CHUNK   = 168                   # hours per chunk (one week)
+TOTAL           = "total"               # region label of country aggregates
+STORE_DIR       = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "..", "..", "store"))
+
+# ───────────── technology parameters ────────────────────────────────────
+# generic 3 MW class turbine: cubic between cut‑in and rated, off above cut‑out
+_V = np.arange(3.0, 12.5, 0.5)
+WIND_CURVE_SPEED = np.r_[0.0, _V, 25.0, 25.0 + 1e-3, 100.0]
+WIND_CURVE_POWER = np.r_[0.0, (_V ** 3 - 27.0) / (12.0 ** 3 - 27.0), 1.0, 0.0, 0.0]
+
+TECHS = {
+    #  tech       model   MW per eligible km²   model parameters
+    "onwind": {"model": "wind", "capacity_per_km2": 3.0,
+               "hub_height": 100.0, "ref_height": 100.0, "shear": 1 / 7},
+    "solar":  {"model": "pv",   "capacity_per_km2": 1.7,
+               "performance_ratio": 0.85, "temp_coeff": -0.004, "noct": 45.0},
+}
+
+# ───────────── vectorised capacity‑factor models ────────────────────────
+
+def wind_cf(wnd100m: np.ndarray, hub_height: float = 100.0, ref_height: float = 100.0,
+            shear: float = 1 / 7, **_) -> np.ndarray:
+    """Capacity factor of the generic turbine for wind speeds at *ref_height*."""
+    speed = wnd100m * np.float32((hub_height / ref_height) ** shear)
+    return np.interp(speed, WIND_CURVE_SPEED, WIND_CURVE_POWER).astype(np.float32, copy=False)
+
+
+def pv_cf(influx: np.ndarray, temperature: np.ndarray, performance_ratio: float = 0.85,
+          temp_coeff: float = -0.004, noct: float = 45.0, **_) -> np.ndarray:
+    """Capacity factor of a horizontal PV array (STC: 1000 W/m², 25 °C cell)."""
+    g     = np.maximum(influx, 0, dtype=np.float32)
+    t_cel = temperature + g * np.float32((noct - 20.0) / 800.0)
+    cf    = g * np.float32(performance_ratio / 1000.0) * (1 + np.float32(temp_coeff) * (t_cel - 25))
+    return np.clip(cf, 0, 1, out=cf)
+
+
+MODELS = {"wind": (wind_cf, ("wnd100m",)), "pv": (pv_cf, ("influx", "temperature"))}
+
+# ───────────── grid helpers ─────────────────────────────────────────────
+
+def cell_area_km2(lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+    """Spherical area of every cell of a regular lat/lon grid → (Y, X)."""
+    dlat = abs(float(lat[1] - lat[0])) if len(lat) > 1 else 1.0
+    dlon = abs(float(lon[1] - lon[0])) if len(lon) > 1 else 1.0
+    phi  = np.radians(np.asarray(lat, dtype=np.float64))
+    band = np.abs(np.sin(phi + np.radians(dlat) / 2) - np.sin(phi - np.radians(dlat) / 2))
+    row  = EARTH_RADIUS_KM ** 2 * np.radians(dlon) * band
+    return np.broadcast_to(row[:, None], (len(lat), len(lon)))
+
+
+def load_weather(path: str) -> dict[str, np.ndarray]:
+    """Open the weather rasters in *path* memory‑mapped (fields missing → skipped)."""
+    data = {k: np.load(os.path.join(path, f"{k}.npy")) for k in ("time", "lat", "lon")}
+    for k in WEATHER_FIELDS:
+        f = os.path.join(path, f"{k}.npy")
+        if os.path.exists(f):
+            data[k] = np.load(f, mmap_mode="r")
+    return data
+
+
+def load_eligibility(path: str, techs=TECHS) -> tuple[np.ndarray, dict[int, dict], dict[str, np.ndarray]]:
+    """Region raster, code → {country, region} and one eligibility mask per tech."""
+    regions = np.load(os.path.join(path, "regions.npy"), mmap_mode="r")
+    with open(os.path.join(path, "regions.json"), encoding="utf-8") as fp:
+        names = {int(k): v for k, v in json.load(fp).items()}
+    masks = {t: np.load(os.path.join(path, f"{t}.npy"), mmap_mode="r")
+             for t in techs if os.path.exists(os.path.join(path, f"{t}.npy"))}
+    return regions, names, masks
+
+def _rows(arr: np.ndarray, t0: int, t1: int) -> np.ndarray:
+    """
+    ``arr[t0:t1]`` – for a memory‑mapped file, a short‑lived map of just those
+    rows, so pages touched by one chunk are released before the next.
+    """
+    if isinstance(arr, np.memmap) and isinstance(arr.base, mmap.mmap) and arr.flags.c_contiguous:
+        frame = arr[:1].nbytes
+        return np.memmap(arr.filename, arr.dtype, "r", offset=arr.offset + t0 * frame,
+                         shape=(t1 - t0, *arr.shape[1:]))
+    return arr[t0:t1]
+
+# ───────────── engine ───────────────────────────────────────────────────
+
+def _zones(names: dict[int, dict]) -> tuple[list[tuple[str, str]], np.ndarray]:
+    """Zone labels (regions, then country totals) and a code → zone‑row lookup."""
+    codes     = sorted(c for c in names if c > 0)
+    countries = sorted({names[c]["country"] for c in codes})
+    labels    = [(names[c]["country"], names[c]["region"]) for c in codes] + [(c, TOTAL) for c in countries]
+    member    = np.zeros((int(max(codes, default=0)) + 1, len(labels)), dtype=bool)
+    for i, c in enumerate(codes):
+        member[c, i] = True
+        member[c, len(codes) + countries.index(names[c]["country"])] = True
+    return labels, member
+
+
+def get_resource_options(weather: dict[str, np.ndarray], regions: np.ndarray,
+                         names: dict[int, dict], masks: dict[str, np.ndarray],
+                         techs: dict = TECHS, chunk_hours: int = DEFAULT_CHUNK,
+                         ) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Hourly capacity factors and potentials for every tech in *masks*.
+
+    Returns ``(profiles, potentials)``: profiles on an hourly UTC index with
+    (technology, country, region) columns, potentials with one row per
+    (technology, country, region); ``region == "total"`` rows aggregate the
+    whole country.
+    """
+    time  = pd.DatetimeIndex(weather["time"], name="utc_timestamp")
+    time  = time.tz_localize("UTC") if time.tz is None else time.tz_convert("UTC")
+    area  = cell_area_km2(weather["lat"], weather["lon"]).ravel()
+    labels, member = _zones(names)
+    codes = np.asarray(regions, dtype=np.int64).ravel()
+    codes = np.where((codes > 0) & (codes < len(member)), codes, 0)
+
+    profiles, potentials = {}, []
+    for tech, mask in masks.items():
+        par      = techs[tech]
+        model, fields = MODELS[par["model"]]
+        weight   = np.clip(np.asarray(mask, dtype=np.float64).ravel(), 0, 1) * area   # eligible km²
+        cells    = np.flatnonzero((weight > 0) & (codes > 0))
+        zone_w   = member[codes[cells]] * weight[cells, None]                          # (cells, zones)
+        zone_km2 = zone_w.sum(axis=0)
+        agg      = (zone_w / np.where(zone_km2 > 0, zone_km2, 1)).astype(np.float32)
+
+        out = np.empty((len(time), len(labels)), dtype=np.float32)
+        for t0 in range(0, len(time), chunk_hours):
+            t1    = min(t0 + chunk_hours, len(time))
+            block = [_rows(weather[f], t0, t1).reshape(t1 - t0, -1)[:, cells] for f in fields]
+            np.matmul(model(*block, **par), agg, out=out[t0:t1])
+        empty = zone_km2 == 0
+        out[:, empty] = np.nan
+        mean  = np.where(empty, np.nan, out.mean(axis=0, dtype=np.float64) if len(time) else np.nan)
+        n     = member[codes[cells]].sum(axis=0)
+
+        for k, (country, region) in enumerate(labels):
+            potentials.append({"technology": tech, "country": country, "region": region,
+                               "cells": int(n[k]), "eligible_km2": zone_km2[k],
+                               "p_nom_max_mw": zone_km2[k] * par["capacity_per_km2"],
+                               "mean_cf": mean[k]})
+        profiles[tech] = out
+
+    cols = pd.MultiIndex.from_tuples([(t, c, r) for t in profiles for c, r in labels],
+                                     names=["technology", "country", "region"])
+    data = np.hstack(list(profiles.values())) if profiles else np.empty((len(time), 0), np.float32)
+    return (pd.DataFrame(data, index=time, columns=cols),
+            pd.DataFrame(potentials, columns=["technology", "country", "region", "cells",
+                                              "eligible_km2", "p_nom_max_mw", "mean_cf"]))
+
+
+def write_store(profiles: pd.DataFrame, potentials: pd.DataFrame, store_dir: str) -> None:
+    os.makedirs(store_dir, exist_ok=True)
+    profiles.to_parquet(os.path.join(store_dir, PROFILES_FILE))
+    potentials.to_csv(os.path.join(store_dir, POTENTIALS_FILE), index=False)
+
+# ───────────── synthetic inputs (tests / benchmarks) ────────────────────
+
+def synthetic(path: str, ny: int = 40, nx: int = 50, hours: int = 8760, seed: int = 0,
+              start: str = "2020-01-01") -> None:
+    """
+    Write a reproducible fake WB6 grid to *path* (weather + eligibility in
+    one folder): Weibull‑ish winds, clear‑sky‑shaped irradiance, a seasonal
+    temperature cycle, three countries with two regions each.
+    """
+    rng = np.random.default_rng(seed)
+    os.makedirs(path, exist_ok=True)
+    lat = np.linspace(44.0, 40.0, ny, dtype=np.float64)
+    lon = np.linspace(19.0, 23.0, nx, dtype=np.float64)
+    t   = np.arange(hours)
+    np.save(os.path.join(path, "time.npy"),
+            np.datetime64(start, "h") + t.astype("timedelta64[h]"))
+    np.save(os.path.join(path, "lat.npy"), lat)
+    np.save(os.path.join(path, "lon.npy"), lon)
+
+    hod, doy = (t % 24)[:, None, None], (t / 24 % 365)[:, None, None]
+    sun = np.clip(np.sin(np.pi * (hod - 5) / 14), 0, None) * (0.75 + 0.25 * np.cos(2 * np.pi * (doy - 172) / 365))
+    arrs = {k: np.lib.format.open_memmap(os.path.join(path, f"{k}.npy"), "w+", np.float32, (hours, ny, nx))
+            for k in WEATHER_FIELDS}
+    for t0 in range(0, hours, DEFAULT_CHUNK):                # written chunked, never whole in RAM
+        sl, shape = slice(t0, min(t0 + DEFAULT_CHUNK, hours)), (min(DEFAULT_CHUNK, hours - t0), ny, nx)
+        arrs["wnd100m"][sl]     = 7.5 * rng.weibull(2.0, shape)
+        arrs["influx"][sl]      = 1000 * sun[sl] * rng.uniform(0.4, 1.0, shape)
+        arrs["temperature"][sl] = 12 - 10 * np.cos(2 * np.pi * (doy[sl] - 15) / 365) + 5 * sun[sl]
+    for arr in arrs.values():
+        arr.flush()
+    del arrs
+
+    regions = np.zeros((ny, nx), dtype=np.int16)
+    yy, xx  = np.mgrid[0:ny, 0:nx]
+    inside  = (yy - ny / 2) ** 2 / (ny / 2) ** 2 + (xx - nx / 2) ** 2 / (nx / 2) ** 2 < 1
+    regions[inside] = 1 + (xx[inside] * 3 // nx) * 2 + (yy[inside] * 2 // ny)
+    np.save(os.path.join(path, "regions.npy"), regions)
+    names = {str(1 + c * 2 + r): {"country": cc, "region": f"{cc}{r + 1}"}
+             for c, cc in enumerate(("AL", "MK", "BA")) for r in range(2)}
+    with open(os.path.join(path, "regions.json"), "w", encoding="utf-8") as fp:
+        json.dump(names, fp, indent=1)
+    for tech in TECHS:
+        np.save(os.path.join(path, f"{tech}.npy"), rng.uniform(0, 1, (ny, nx)).astype(np.float32) * inside)
+
+# ───────────── main entry ───────────────────────────────────────────────
+
+def run(overwrite: bool = False) -> None:
+    vre       = load_config().get("VRE") or {}
+    weather   = load_weather(vre.get("WEATHER_DIR", "data/weather"))
+    regions, names, masks = load_eligibility(vre.get("ELIGIBILITY_DIR", "data/eligibility"))
+    store_dir = vre.get("STORE_DIR", STORE_DIR)
+    profiles, potentials = get_resource_options(
+        weather, regions, names, masks, chunk_hours=int(vre.get("CHUNK_HOURS", DEFAULT_CHUNK)))
+    write_store(profiles, potentials, store_dir)
+    print(f"✅ VRE options saved to {store_dir} ({len(profiles)} hours, "
+          f"{profiles.shape[1]} profiles, {len(potentials)} potentials)")
+
+if __name__ == "__main__":
+    run()
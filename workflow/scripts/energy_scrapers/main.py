@@ -8,7 +8,19 @@ mepso        – hourly demand (existing)
 mepso_gen    – generation mix by technology (NEW)
 ost          – OST demand (existing)
 nosbih       – NOSBiH demand (existing)
+panel        – harmonised WB6 hourly panel built from the outputs above
+export       – PyPSA load series + OSeMOSYS timeslice demand tables (cached;
+               the OSeMOSYS tables need at least one fully observed year)
 all          – run every target above
+
+Modes
+-----
+(default)    – batch run over START_DATE … END_DATE from config.yaml
+--watch      – poll the scraper targets for newly published days and
+               append them to the outputs (see watch.py); --once = one round
+--shard i/N  – scrape only block i of N of the window into a partial
+               output + manifest (see shards.py)
+--merge      – combine all shard partials into the canonical data/*.csv
 """
 import argparse
 
@@ -22,21 +34,73 @@ from energy_scrapers import (
 # generation-mix scraper (new module you added as *mepso_gen_scraper.py*)
 import energy_scrapers.mepso_gen_scraper as download_mepso_gen
 
+# build steps over the scraper outputs
+from energy_scrapers import export, panel
+
+from energy_scrapers import shards, watch
+from energy_scrapers.framework import load_config
+
+# target → framework.Source subclass (scrapers only)
+SOURCES = {
+    "mepso":     download_mepso.MepsoDemand,
+    "mepso_gen": download_mepso_gen.MepsoGeneration,
+    "ost":       download_ost.OstSource,
+    "nosbih":    download_nosbih.NosbihSource,
+}
+
 
 def main() -> None:
     parser = argparse.ArgumentParser(description="Energy Data Downloader")
     parser.add_argument(
         "--target",
         type=str,
-        choices=["mepso", "mepso_gen", "ost", "nosbih", "all"],
+        choices=["mepso", "mepso_gen", "ost", "nosbih", "panel", "export", "all"],
         required=True,
         help="Dataset to download",
     )
     parser.add_argument(
         "--overwrite", action="store_true", help="Overwrite existing files"
     )
+    parser.add_argument(
+        "--watch", action="store_true",
+        help="Poll for newly published days and append them (low-latency mode)",
+    )
+    parser.add_argument(
+        "--once", action="store_true", help="With --watch: run a single poll round"
+    )
+    parser.add_argument(
+        "--shard", type=str, metavar="i/N",
+        help="Backfill only shard i of N (0-based) into a partial output + manifest",
+    )
+    parser.add_argument(
+        "--merge", action="store_true", help="Merge all shard partials into the outputs"
+    )
     args = parser.parse_args()
 
+    if args.shard or args.merge:
+        if args.target in ("panel", "export") or args.watch or (args.shard and args.merge):
+            parser.error("--shard / --merge apply to scraper batch runs, one at a time")
+        cfg     = load_config()
+        targets = SOURCES if args.target == "all" else [args.target]
+        if args.merge:
+            for t in targets:
+                shards.merge(SOURCES[t](cfg))
+            return
+        try:
+            i, n = shards.parse_shard(args.shard)
+        except ValueError as exc:
+            parser.error(str(exc))
+        for t in targets:
+            shards.run_shard(SOURCES[t](cfg), i, n)
+        return
+
+    if args.watch:
+        if args.target in ("panel", "export"):
+            parser.error("--watch applies to scraper targets only")
+        targets = SOURCES if args.target == "all" else [args.target]
+        watch.watch([SOURCES[t] for t in targets], load_config(), once=args.once)
+        return
+
     if args.target in ("mepso", "all"):
         download_mepso.run(overwrite=args.overwrite)
 
@@ -49,6 +113,12 @@ def main() -> None:
     if args.target in ("nosbih", "all"):
         download_nosbih.run(overwrite=args.overwrite)
 
+    if args.target in ("panel", "all"):
+        panel.run(overwrite=args.overwrite)
+
+    if args.target in ("export", "all"):
+        export.run(overwrite=args.overwrite)
+
 
 if __name__ == "__main__":
     main()
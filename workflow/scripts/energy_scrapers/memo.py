@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Persistent parse‑result memo
+============================
+Maps (payload sha256, parser name, parser version) → parsed result, so a
+rerun over an unchanged MEPSO PDF or OST workbook skips pdfplumber/openpyxl
+entirely.  The version is a hash of the parser functions' *source* (plus any
+constants passed alongside), so editing `extract_via_table`, `clean_cells`,
+the OST cell reader, … invalidates old entries automatically.
+
+Results are stored as JSON in one SQLite file (`PARSE_MEMO` in config.yaml);
+negative results (None) are memoised too.
+"""
+from __future__ import annotations
+import hashlib, inspect, json, os, sqlite3, threading
+from typing import Any, Callable
+
+_MISS = object()
+
+
+def parser_version(*parts: Any) -> str:
+    """Hash functions (by source) and plain constants into a version tag."""
+    h = hashlib.sha1()
+    for part in parts:
+        if callable(part):
+            try:
+                blob = inspect.getsource(part).encode()
+            except (OSError, TypeError):
+                blob = part.__code__.co_code
+        else:
+            blob = repr(part).encode()
+        h.update(blob)
+        h.update(b"\0")
+    return h.hexdigest()[:16]
+
+
+class ParseMemo:
+    """Thread‑safe SQLite memo; a ``None`` path turns it into a pass‑through."""
+
+    def __init__(self, path: str | None) -> None:
+        self.path = path
+        self.hits = self.misses = 0
+        self._lock = threading.Lock()
+        self._db: sqlite3.Connection | None = None
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS memo ("
+                " digest TEXT, parser TEXT, version TEXT, result TEXT,"
+                " PRIMARY KEY (digest, parser, version))"
+            )
+            self._db.commit()
+
+    def get(self, digest: str, parser: str, version: str) -> Any:
+        if self._db is None:
+            return _MISS
+        with self._lock:
+            row = self._db.execute(
+                "SELECT result FROM memo WHERE digest=? AND parser=? AND version=?",
+                (digest, parser, version),
+            ).fetchone()
+        return _MISS if row is None else json.loads(row[0])
+
+    def put(self, digest: str, parser: str, version: str, result: Any) -> None:
+        if self._db is None:
+            return
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO memo VALUES (?, ?, ?, ?)",
+                (digest, parser, version, json.dumps(result)),
+            )
+            self._db.commit()
+
+    def parse(self, digest: str, parser: str, version: str, fn: Callable[[], Any]) -> Any:
+        """Return the memoised result for the key, calling *fn* on a miss."""
+        hit = self.get(digest, parser, version)
+        if hit is not _MISS:
+            self.hits += 1
+            return hit
+        self.misses += 1
+        result = fn()
+        self.put(digest, parser, version, result)
+        return result
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+def open_memo(cfg: dict) -> ParseMemo:
+    """Open the memo configured by `PARSE_MEMO` (disabled when empty)."""
+    return ParseMemo(cfg.get("PARSE_MEMO") or None)
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Shared MEPSO helpers
+====================
+URL variants, number normalisation and the PDF → 24‑hour row logic used by
+both the demand (`download_mepso.py`) and generation‑mix
+(`mepso_gen_scraper.py`) scrapers.
+"""
+from __future__ import annotations
+import logging, os, re, pdfminer, pdfplumber
+from datetime import date
+from urllib.parse import quote
+from pdfplumber.utils.exceptions import PdfminerException
+from pdfminer.high_level import extract_text as pdfminer_text
+from energy_scrapers.framework import Request, Source
+from energy_scrapers.payload import Payload, reader
+
+logging.getLogger("pdfminer").setLevel(logging.ERROR)
+BASE_DIR = "https://www.mepso.com.mk/files/mk/dnevni"
+# extraction output depends on these too → part of every MEPSO parser version
+PDF_LIBS = (f"pdfplumber {pdfplumber.__version__}", f"pdfminer {pdfminer.__version__}")
+
+# ───────────── regex helpers ────────────────────────────────────────────
+SPACE    = r"[ \u00A0\u202F]"  # space / NBSP / NNBSP
+TOKEN_RE = re.compile(r"\d{1,3}(?:[.,\u00A0\u202F ]\d{3})*[.,]\d+")
+
+# ───────────── punctuation normaliser ───────────────────────────────────
+
+def normalise(tok: str) -> float:
+    """Return *tok* as float regardless of ,/. placement."""
+    tok = re.sub(SPACE, "", tok)
+    if "," in tok and "." in tok:
+        pos = max(tok.rfind(","), tok.rfind("."))
+        tok = tok[:pos].replace(",", "").replace(".", "") + "." + tok[pos + 1 :]
+    else:
+        tok = tok.replace(",", ".")
+    return float(tok)
+
+# ───────────── possible filenames for a given day ───────────────────────
+
+def url_variants(day: date, base_dir: str = BASE_DIR) -> list[str]:
+    dmy, yy = day.strftime("%d.%m.%Y"), day.strftime("%y%m%d")
+    return [
+        f"{base_dir}/{quote(f'Информација за {dmy}.pdf')}",
+        f"{base_dir}/{quote(f'Информација {dmy}.pdf')}",
+        f"{base_dir}/{quote(f'WebReport-{yy}_mk.pdf')}",
+    ]
+
+# ───────────── PDF readers ──────────────────────────────────────────────
+
+def first_table(raw: bytes | memoryview) -> list[list[str | None]] | None:
+    """Ruled table of page 1, or None."""
+    try:
+        with pdfplumber.open(reader(raw)) as pdf:
+            page = pdf.pages[0]
+            return page.extract_table({
+                "vertical_strategy": "lines",
+                "horizontal_strategy": "lines",
+                "snap_tolerance": 3,
+            })
+    except PdfminerException:
+        return None
+
+
+def pdf_text(raw: bytes | memoryview) -> str:
+    """All page text via pdfplumber, falling back to raw pdfminer."""
+    try:
+        with pdfplumber.open(reader(raw)) as pdf:
+            txt = "\n".join(p.extract_text() or "" for p in pdf.pages)
+    except PdfminerException:
+        txt = ""
+    if not txt.strip():
+        try:
+            txt = pdfminer_text(reader(raw))
+        except Exception:
+            txt = ""
+    return txt
+
+# ───────────── helpers to clean a row into 24 hours ─────────────────────
+
+def clean_cells(cells: list[str | None], sum_thres: float) -> list[float | None] | None:
+    """Convert the *data* part of a PDF row to 24 hourly floats/None."""
+    # drop trailing empties some tables have
+    while cells and not cells[-1]:
+        cells.pop()
+
+    # we ignore positional blanks – squeeze to numeric tokens
+    numeric = [c for c in cells if c and re.search(r"\d", c)]
+    if not numeric:
+        return None
+
+    if len(numeric) > 24 or normalise(numeric[0]) > sum_thres:
+        numeric = numeric[1:]            # discard daily sum
+
+    # pad if MEPSO omitted one hour (rare daylight‑saving glitch)
+    if len(numeric) < 24:
+        numeric.extend([None] * (24 - len(numeric)))
+    elif len(numeric) > 24:
+        numeric = numeric[-24:]          # keep last 24 numbers
+
+    if len(numeric) != 24:
+        return None
+
+    try:
+        return [None if v is None else normalise(v) for v in numeric]
+    except Exception:
+        return None
+
+
+def line_to_24(line: str, sum_thres: float) -> list[float | None] | None:
+    """Pull 24 hourly numbers out of one text line (regex fallback)."""
+    tokens = TOKEN_RE.findall(line)
+    if not tokens:
+        return None
+    vals = [normalise(t) for t in tokens]
+    if len(vals) > 24 or vals[0] > sum_thres:
+        vals = vals[1:]
+    if len(vals) < 24:
+        vals.extend([None] * (24 - len(vals)))
+    elif len(vals) > 24:
+        vals = vals[-24:]
+    return vals if len(vals) == 24 else None
+
+# ───────────── source base ──────────────────────────────────────────────
+
+class MepsoSource(Source):
+    """MEPSO daily PDFs: URL variants + stash of unparsable payloads."""
+
+    base_url = BASE_DIR
+    url_key  = "mepso"
+
+    def requests(self, day: date) -> list[Request]:
+        return [Request(url) for url in url_variants(day, self.base_url)]
+
+    def unparsed(self, day: date, payload: Payload) -> None:
+        # stash for manual inspection
+        raw   = payload.view
+        ext   = "pdf" if raw[:4] == b"%PDF" else "bin"
+        fname = os.path.join(self.out_dir, f"mepso_{day:%Y-%m-%d}_unparsed.{ext}")
+        if not os.path.exists(fname):
+            with open(fname, "wb") as fp:
+                fp.write(raw)
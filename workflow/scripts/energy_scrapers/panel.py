@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+WB6 hourly panel builder
+========================
+Loads every scraper output once and aligns it on a single tz‑aware hourly
+UTC index, so model input prep becomes one read of `wb6_panel.parquet`.
+
+* MEPSO / OST emit `date,hour,<vars>` – hour 1 is the first interval of the
+  *local* day.
+* NOSBiH emits `datetime` (= local date + hour‑1) split over two files.
+* Hours are counted from local midnight, so DST days get 23 or 25 slots:
+  the 24th ordinal of a spring‑forward day is dropped (it would collide with
+  the next day's first hour) and the 25th slot of a fall‑back day stays NaN.
+* Columns form a (country, variable) MultiIndex; rows are interval starts
+  in UTC.
+"""
+from __future__ import annotations
+import io, os, numpy as np, pandas as pd
+from energy_scrapers.framework import load_config
+
+PANEL_FILE = "wb6_panel.parquet"
+
+# ───────────── source outputs → (country, tz, variables) ────────────────
+#   file name           country  local tz            time layout   variables
+SOURCES = [
+    ("mepso_data.csv",        "MK", "Europe/Skopje",   "date_hour", ["demand"]),
+    ("mepso_gen_mix.csv",     "MK", "Europe/Skopje",   "date_hour",
+        ["Hydro", "Thermal", "Natural_gas", "Wind_power", "Solar_power"]),
+    ("ost_data.csv",          "AL", "Europe/Tirane",   "date_hour", ["demand"]),
+    ("nosbih_demand.csv",     "BA", "Europe/Sarajevo", "datetime",  ["demand"]),
+    ("nosbih_generation.csv", "BA", "Europe/Sarajevo", "datetime",  ["power_generation"]),
+]
+
+# ───────────── local (day, hour‑ordinal) → UTC ──────────────────────────
+
+def local_hours_to_utc(days: pd.Series, ordinal: np.ndarray, tz: str) -> pd.DatetimeIndex:
+    """
+    Map local calendar *days* and 0‑based hour *ordinal* to UTC interval
+    starts.  Ordinals past the end of a short (DST) day come back as NaT.
+    """
+    uniq, inv = np.unique(pd.to_datetime(days).to_numpy(dtype="datetime64[D]"), return_inverse=True)
+    days_ns   = pd.DatetimeIndex(uniq).as_unit("ns")
+    midnights = days_ns.tz_localize(tz, nonexistent="shift_forward")
+    next_mid  = (days_ns + pd.Timedelta(days=1)).tz_localize(tz, nonexistent="shift_forward")
+    start = midnights.tz_convert("UTC").asi8[inv]
+    n_hrs = ((next_mid.asi8 - midnights.asi8) // 3_600_000_000_000)[inv]
+
+    ordinal = np.asarray(ordinal, dtype="int64")
+    stamps  = start + ordinal * 3_600_000_000_000
+    stamps  = np.where((ordinal >= 0) & (ordinal < n_hrs), stamps, np.iinfo("int64").min)
+    return pd.DatetimeIndex(stamps.view("datetime64[ns]")).tz_localize("UTC")
+
+
+def _load(path: str | io.BytesIO, tz: str, layout: str, variables: list[str]) -> pd.DataFrame:
+    df = pd.read_csv(path)
+    if layout == "date_hour":
+        idx = local_hours_to_utc(df["date"], df["hour"].to_numpy() - 1, tz)
+    else:
+        stamp = pd.to_datetime(df["datetime"])
+        idx   = local_hours_to_utc(stamp.dt.normalize(), stamp.dt.hour.to_numpy(), tz)
+    out = df.reindex(columns=variables).set_axis(idx)
+    return out[out.index.notna() & ~out.index.duplicated(keep="first")]
+
+# ───────────── build ────────────────────────────────────────────────────
+
+def build_panel(out_dir: str, sources: list = SOURCES,
+                files: dict[str, bytes] | None = None) -> pd.DataFrame:
+    """
+    Return the wide (country × variable) panel of *sources* in *out_dir*;
+    contents already in memory can be passed as *files* (name → bytes).
+    """
+    frames: dict[tuple[str, str], pd.Series] = {}
+    for fname, country, tz, layout, variables in sources:
+        path = os.path.join(out_dir, fname)
+        if files is not None and fname in files:
+            path = io.BytesIO(files[fname])
+        elif not os.path.exists(path):
+            print(f"⚠️  {fname} not found – skipped")
+            continue
+        df = _load(path, tz, layout, variables)
+        for var in variables:
+            frames[(country, var)] = df[var].astype("float64")
+
+    if not frames:
+        raise FileNotFoundError(f"no scraper outputs found in {out_dir}")
+
+    lo = min(s.index.min() for s in frames.values())
+    hi = max(s.index.max() for s in frames.values())
+    index = pd.date_range(lo, hi, freq="h", tz="UTC", name="utc_timestamp")
+
+    panel = pd.DataFrame(
+        {key: s.reindex(index).to_numpy() for key, s in frames.items()}, index=index
+    )
+    panel.columns = pd.MultiIndex.from_tuples(panel.columns, names=["country", "variable"])
+    return panel.sort_index(axis=1)
+
+
+def load_panel(out_dir: str) -> pd.DataFrame:
+    """Read the panel written by :func:`run`."""
+    return pd.read_parquet(os.path.join(out_dir, PANEL_FILE))
+
+# ───────────── main entry ───────────────────────────────────────────────
+
+def run(overwrite: bool = False) -> None:
+    out_dir = load_config()["OUTPUT_DIR"]
+
+    panel    = build_panel(out_dir)
+    out_path = os.path.join(out_dir, PANEL_FILE)
+    panel.to_parquet(out_path)
+    print(
+        f"✅ WB6 panel saved to {out_path} "
+        f"({len(panel):,} hours × {panel.shape[1]} series, {int(panel.count().sum()):,} values)"
+    )
+
+if __name__ == "__main__":
+    run()
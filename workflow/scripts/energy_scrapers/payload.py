@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Spooled, memory‑mapped raw payloads
+===================================
+Downloads are streamed in chunks into a spool: small bodies stay in memory,
+anything above `SPOOL_MAX` spills to an anonymous temp file which is then
+memory‑mapped.  Parsers get a read‑only `memoryview` (`Payload.view`) and
+open it with :func:`reader` – a seekable file object over the *same* buffer,
+so the table, regex and pdfminer fallbacks never copy the body.
+
+    payload = download(url, session=sess)       # None unless HTTP 200, NotModified on 304
+    if payload is not None:
+        with payload:
+            vals = extract_via_table(payload.view) or extract_via_regex(payload.view)
+"""
+from __future__ import annotations
+import hashlib, io, mmap, os, tempfile, requests
+
+SPOOL_MAX = 1 << 20          # bodies above 1 MiB spill to disk
+CHUNK     = 64 << 10         # streaming chunk size
+
+
+class NotModified(Exception):
+    """A conditional request was answered with 304 – the known body is current."""
+
+
+class Payload:
+    """Response body held in memory or in a memory‑mapped temp file."""
+
+    def __init__(self, max_size: int = SPOOL_MAX) -> None:
+        self._max  = max_size
+        self._buf: io.BytesIO | None = io.BytesIO()
+        self._file = None
+        self._map: mmap.mmap | None = None
+        self.view: memoryview | None = None
+        self.size = 0
+        self._digest: str | None = None
+        self.validators: dict[str, str] = {}     # ETag / Last-Modified of the response
+
+    # ───────────── writing ──────────────────────────────────────────────
+    def write(self, chunk: bytes) -> None:
+        if self._buf is not None and self.size + len(chunk) > self._max:
+            self._file = tempfile.TemporaryFile()
+            self._file.write(self._buf.getbuffer())
+            self._buf = None
+        (self._buf if self._buf is not None else self._file).write(chunk)
+        self.size += len(chunk)
+
+    def seal(self) -> "Payload":
+        """Finish writing and expose the body as :attr:`view`."""
+        if self._buf is not None:
+            self.view = self._buf.getbuffer()
+        elif self.size:
+            self._file.flush()
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self.view = memoryview(self._map)
+        else:
+            self.view = memoryview(b"")
+        return self
+
+    @property
+    def digest(self) -> str:
+        """sha256 of the body (hashed straight from the view, once)."""
+        if self._digest is None:
+            self._digest = hashlib.sha256(self.view).hexdigest()
+        return self._digest
+
+    @property
+    def spilled(self) -> bool:
+        return self._file is not None
+
+    @classmethod
+    def from_path(cls, path: str) -> "Payload":
+        """Memory‑map a local file (benchmarks, stashed `_unparsed` payloads)."""
+        p = cls()
+        p._buf, p.size = None, os.path.getsize(path)
+        p._file = open(path, "rb")
+        return p.seal()
+
+    # ───────────── cleanup ──────────────────────────────────────────────
+    def close(self) -> None:
+        if self.view is not None:
+            self.view.release()
+            self.view = None
+        if self._map is not None:
+            try:
+                self._map.close()
+            except BufferError:      # a parser still holds a slice – GC closes it
+                pass
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._buf = None
+
+    def __enter__(self) -> "Payload":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class _ViewReader(io.RawIOBase):
+    """Seekable read‑only file object over a memoryview (no copy on open)."""
+
+    def __init__(self, view) -> None:
+        self._view = memoryview(view)
+        self._pos  = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._pos, io.SEEK_END: len(self._view)}[whence]
+        self._pos = max(0, base + offset)
+        return self._pos
+
+    def read(self, size: int = -1) -> bytes:
+        end = len(self._view) if size is None or size < 0 else min(len(self._view), self._pos + size)
+        data = self._view[self._pos:end].tobytes() if end > self._pos else b""
+        self._pos = max(self._pos, end)
+        return data
+
+    readall = read
+
+    def readinto(self, b) -> int:
+        data = self.read(len(b))
+        b[: len(data)] = data
+        return len(data)
+
+    def close(self) -> None:
+        if not self.closed:
+            self._view.release()
+        super().close()
+
+
+def reader(view) -> io.RawIOBase:
+    """Return a fresh seekable reader over *view* (bytes, memoryview or mmap)."""
+    return _ViewReader(view)
+
+
+def download(url: str, *, session: requests.Session | None = None, method: str = "GET",
+             timeout: float = 10, max_size: int = SPOOL_MAX, **kwargs) -> Payload | None:
+    """
+    Stream *url* into a sealed :class:`Payload`; None unless HTTP 200, and
+    :class:`NotModified` for a 304 so callers can tell "unchanged" from
+    "absent".  The caller owns the payload and must close it (it is a
+    context manager).
+    """
+    http = session or requests
+    with http.request(method, url, timeout=timeout, stream=True, **kwargs) as resp:
+        if resp.status_code != 200:
+            resp.content                  # drain the (small) body so the connection is pooled
+            if resp.status_code == 304:
+                raise NotModified(url)
+            return None
+        payload = Payload(max_size)
+        payload.validators = {k: resp.headers[k] for k in ("ETag", "Last-Modified") if k in resp.headers}
+        try:
+            for chunk in resp.iter_content(CHUNK):
+                payload.write(chunk)
+        except Exception:
+            payload.close()
+            raise
+    return payload.seal()
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Local read‑only query service
+=============================
+Loads the scraper outputs once into typed NumPy arrays and answers HTTP/JSON
+queries from memory, so dashboards and model jobs stop re‑parsing the CSVs:
+
+    python -m energy_scrapers.serve                       # SERVE_HOST:SERVE_PORT
+    curl 'localhost:8765/sources'
+    curl 'localhost:8765/series?source=mepso_data&variable=demand&start=2025-01-01&end=2025-01-31'
+    curl 'localhost:8765/series?source=ost_data&variable=demand&freq=month&agg=sum'
+
+* One table per output file (`panel.SOURCES`): local `day` (datetime64[D]),
+  `hour` (1‑24) and one float64 column per variable, sorted, so a date
+  range is two `searchsorted` calls.
+* `freq=day|month` aggregates on the fly (`agg=mean|sum|min|max|count`,
+  NaN‑aware) with `np.bincount` / `np.fmin.reduceat`.
+* Encoded responses sit in an LRU cache (`SERVE_CACHE` entries).
+* A watcher thread re‑stats the files every `SERVE_RELOAD` seconds;
+  a changed file is re‑read and the cache dropped.
+
+Read‑only and bound to localhost by default – not meant to face a network.
+"""
+from __future__ import annotations
+import json, os, threading, numpy as np, pandas as pd
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+from energy_scrapers.framework import load_config
+from energy_scrapers.panel import SOURCES
+
+DEFAULT_HOST   = "127.0.0.1"
+DEFAULT_PORT   = 8765
+DEFAULT_CACHE  = 256        # cached responses
+DEFAULT_RELOAD = 2.0        # seconds between file checks
+FREQS          = {"hour": None, "day": "datetime64[D]", "month": "datetime64[M]"}
+AGGS           = ("mean", "sum", "min", "max", "count")
+
+
+class QueryError(ValueError):
+    """Bad request parameters → HTTP *status*."""
+
+    def __init__(self, msg: str, status: int = 400) -> None:
+        super().__init__(msg)
+        self.status = status
+
+# ───────────── typed tables ─────────────────────────────────────────────
+
+def load_table(path: str, layout: str, variables: list[str]) -> dict[str, np.ndarray]:
+    """One output CSV → {"day", "hour", <variable>…} arrays sorted by (day, hour)."""
+    df = pd.read_csv(path)
+    if layout == "date_hour":
+        day  = pd.to_datetime(df["date"]).to_numpy(dtype="datetime64[D]")
+        hour = df["hour"].to_numpy(dtype=np.int8)
+    else:
+        stamp = pd.to_datetime(df["datetime"])
+        day   = stamp.to_numpy(dtype="datetime64[D]")
+        hour  = (stamp.dt.hour.to_numpy() + 1).astype(np.int8)
+    order = np.lexsort((hour, day))
+    table = {"day": day[order], "hour": hour[order]}
+    for var in variables:
+        col = df[var] if var in df.columns else pd.Series(np.nan, index=df.index)
+        table[var] = pd.to_numeric(col, errors="coerce").to_numpy(dtype=np.float64)[order]
+    return table
+
+
+def aggregate(keys: np.ndarray, values: np.ndarray, agg: str) -> tuple[np.ndarray, np.ndarray]:
+    """Group sorted *keys*, reduce *values* with *agg* ignoring NaN."""
+    if not len(keys):
+        return keys, values
+    starts = np.r_[0, np.flatnonzero(keys[1:] != keys[:-1]) + 1]
+    group  = np.repeat(np.arange(len(starts)), np.diff(np.r_[starts, len(keys)]))
+    ok     = ~np.isnan(values)
+    count  = np.bincount(group[ok], minlength=len(starts))
+    if agg == "count":
+        out = count.astype(np.float64)
+    elif agg in ("sum", "mean"):
+        total = np.bincount(group[ok], values[ok], minlength=len(starts))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            out = total / count if agg == "mean" else np.where(count > 0, total, np.nan)
+    else:
+        out = (np.fmin if agg == "min" else np.fmax).reduceat(values, starts)
+    return keys[starts], out
+
+
+def _labels(keys: np.ndarray) -> list[str]:
+    return np.datetime_as_string(keys).tolist()
+
+
+def _floats(values: np.ndarray) -> str:
+    """JSON array of *values* with NaN → null (json.dumps emits bare NaN)."""
+    return json.dumps(values.tolist()).replace("NaN", "null")
+
+# ───────────── store: tables + LRU + reload ─────────────────────────────
+
+class Store:
+    """In‑memory tables of every output in *out_dir* plus a response cache."""
+
+    def __init__(self, out_dir: str, cache_size: int = DEFAULT_CACHE, sources: list = SOURCES) -> None:
+        self.out_dir    = out_dir
+        self.sources    = {os.path.splitext(s[0])[0]: s for s in sources}
+        self.cache_size = cache_size
+        self.tables: dict[str, dict[str, np.ndarray]] = {}
+        self._stats: dict[str, tuple[int, int] | None] = {}
+        self._cache: OrderedDict[tuple, bytes] = OrderedDict()
+        self._lock  = threading.Lock()
+        self.hits = self.misses = self.reloads = 0
+        self.refresh()
+
+    def refresh(self) -> list[str]:
+        """Re‑read every output whose size/mtime changed; return their names."""
+        changed = []
+        for name, (fname, _, _, layout, variables) in self.sources.items():
+            path = os.path.join(self.out_dir, fname)
+            try:
+                st   = os.stat(path)
+                stat = (st.st_size, st.st_mtime_ns)
+            except FileNotFoundError:
+                stat = None
+            if stat == self._stats.get(name, ()):
+                continue
+            try:
+                table = load_table(path, layout, variables) if stat else None
+            except Exception as exc:              # half‑written file – retry next round
+                print(f"⚠️  {fname}: reload failed – {exc}")
+                continue
+            with self._lock:
+                if table is None:
+                    self.tables.pop(name, None)
+                else:
+                    self.tables[name] = table
+                self._stats[name] = stat
+                self._cache.clear()
+            changed.append(name)
+        self.reloads += bool(changed)
+        return changed
+
+    def info(self) -> bytes:
+        with self._lock:                          # the reload thread adds/drops entries
+            tables = dict(self.tables)
+        out = {}
+        for name, t in tables.items():
+            fname, country, tz, _, variables = self.sources[name]
+            out[name] = {"file": fname, "country": country, "timezone": tz, "variables": variables,
+                         "rows": len(t["day"]),
+                         "first": str(t["day"][0]) if len(t["day"]) else None,
+                         "last":  str(t["day"][-1]) if len(t["day"]) else None}
+        return json.dumps(out).encode()
+
+    def query(self, source: str, variable: str, start: str | None = None, end: str | None = None,
+              freq: str = "hour", agg: str = "mean") -> bytes:
+        """Encoded JSON slice of *source*/*variable* over [start, end] (local days)."""
+        key = (source, variable, start, end, freq, agg)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return self._cache[key]
+            table = self.tables.get(source)
+            self.misses += 1
+
+        if table is None:
+            raise QueryError(f"unknown source {source!r}", 404)
+        if variable not in table or variable in ("day", "hour"):
+            raise QueryError(f"unknown variable {variable!r} for {source}", 404)
+        if freq not in FREQS:
+            raise QueryError(f"freq must be one of {', '.join(FREQS)}")
+        if agg not in AGGS:
+            raise QueryError(f"agg must be one of {', '.join(AGGS)}")
+        try:
+            lo = np.searchsorted(table["day"], np.datetime64(start, "D")) if start else 0
+            hi = np.searchsorted(table["day"], np.datetime64(end, "D"), "right") if end else len(table["day"])
+        except ValueError:
+            raise QueryError("start/end must be YYYY-MM-DD") from None
+
+        day, values = table["day"][lo:hi], table[variable][lo:hi]
+        head = {"source": source, "variable": variable, "freq": freq}
+        if freq == "hour":
+            body = (f'{json.dumps(head)[:-1]}, "index": {json.dumps(_labels(day))}, '
+                    f'"hour": {json.dumps(table["hour"][lo:hi].tolist())}, "values": {_floats(values)}}}')
+        else:
+            keys, out = aggregate(day.astype(FREQS[freq]), values, agg)
+            head["agg"] = agg
+            body = f'{json.dumps(head)[:-1]}, "index": {json.dumps(_labels(keys))}, "values": {_floats(out)}}}'
+
+        data = body.encode()
+        with self._lock:
+            if self.tables.get(source) is table:      # not reloaded meanwhile
+                self._cache[key] = data
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return data
+
+# ───────────── HTTP front end ───────────────────────────────────────────
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"                     # keep‑alive for load generators
+    disable_nagle_algorithm = True                    # headers + body without a 40 ms ACK stall
+    server: "QueryServer"
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def _send(self, status: int, body: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        url   = urlsplit(self.path)
+        args  = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        store = self.server.store
+        try:
+            if url.path == "/sources":
+                return self._send(200, store.info())
+            if url.path == "/health":
+                return self._send(200, json.dumps({"ok": True, "cache_hits": store.hits,
+                                                   "cache_misses": store.misses,
+                                                   "reloads": store.reloads}).encode())
+            if url.path == "/series":
+                if "source" not in args or "variable" not in args:
+                    raise QueryError("source and variable are required")
+                return self._send(200, store.query(args["source"], args["variable"], args.get("start"),
+                                                   args.get("end"), args.get("freq", "hour"),
+                                                   args.get("agg", "mean")))
+            raise QueryError(f"no such endpoint {url.path}", 404)
+        except QueryError as exc:
+            self._send(exc.status, json.dumps({"error": str(exc)}).encode())
+        except Exception as exc:                  # never drop the connection without a reply
+            self._send(500, json.dumps({"error": f"{type(exc).__name__}: {exc}"}).encode())
+
+
+class QueryServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, store: Store, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                 reload_every: float = DEFAULT_RELOAD) -> None:
+        super().__init__((host, port), Handler)
+        self.store = store
+        self._stop = threading.Event()
+        threading.Thread(target=self._watch, args=(reload_every,), name="serve-reload", daemon=True).start()
+
+    def _watch(self, every: float) -> None:
+        while not self._stop.wait(every):
+            for name in self.store.refresh():
+                print(f"🔄 reloaded {name}")
+
+    def server_close(self) -> None:
+        self._stop.set()
+        super().server_close()
+
+# ───────────── main entry ───────────────────────────────────────────────
+
+def run(overwrite: bool = False) -> None:
+    cfg   = load_config()
+    store = Store(cfg["OUTPUT_DIR"], int(cfg.get("SERVE_CACHE", DEFAULT_CACHE)))
+    srv   = QueryServer(store, cfg.get("SERVE_HOST", DEFAULT_HOST), int(cfg.get("SERVE_PORT", DEFAULT_PORT)),
+                        float(cfg.get("SERVE_RELOAD", DEFAULT_RELOAD)))
+    host, port = srv.server_address[:2]
+    print(f"✅ serving {', '.join(store.tables) or 'no outputs yet'} on http://{host}:{port}")
+    try:
+        srv.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        srv.server_close()
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Sharded backfill with deterministic merge
+=========================================
+Each TSO caps how fast one client may go, so a long backfill is split over
+N machines/processes:
+
+    python -m energy_scrapers.main --target all --shard 0/4    # node 0
+    …
+    python -m energy_scrapers.main --target all --shard 3/4    # node 3
+    python -m energy_scrapers.main --target all --merge        # any node
+
+* A source's candidate list (days, or OST's candidate filename dates which
+  run one month past END_DATE) is cut into N contiguous, disjoint blocks.
+* Shard i writes the raw per‑task rows of its block to
+  `SHARD_DIR/<source>.part-<i>-of-<N>.jsonl` plus a `.json` manifest
+  (window, block bounds, row count, sha256, parser version).
+* `--merge` checks that all N manifests exist and agree with config.yaml
+  and the local parser version, re‑assembles the results in candidate
+  order and hands them to the source's normal `emit` – so the CSVs match a
+  single‑node run byte for byte.
+
+`SHARD_DIR` defaults to `OUTPUT_DIR/shards`; copy the part files there
+before merging if the nodes do not share a filesystem.
+"""
+from __future__ import annotations
+import glob, hashlib, json, os
+from energy_scrapers.framework import Source, run_pipeline, to_date
+from energy_scrapers.memo import open_memo
+
+
+def parse_shard(spec: str) -> tuple[int, int]:
+    """'i/N' → (i, N) with 0 ≤ i < N."""
+    try:
+        i, n = (int(x) for x in spec.split("/"))
+    except ValueError:
+        raise ValueError(f"shard must look like i/N, got {spec!r}") from None
+    if not (n > 0 and 0 <= i < n):
+        raise ValueError(f"shard index out of range: {spec!r} (use 0/N … N-1/N)")
+    return i, n
+
+
+def shard_block(tasks: list, i: int, n: int) -> list:
+    """Contiguous block *i* of *n* – disjoint and covering *tasks*."""
+    return tasks[len(tasks) * i // n: len(tasks) * (i + 1) // n]
+
+
+def shard_dir(cfg: dict) -> str:
+    return cfg.get("SHARD_DIR") or os.path.join(cfg["OUTPUT_DIR"], "shards")
+
+
+def _paths(cfg: dict, name: str, i: int, n: int) -> tuple[str, str]:
+    stem = os.path.join(shard_dir(cfg), f"{name}.part-{i}-of-{n}")
+    return stem + ".jsonl", stem + ".json"
+
+
+def _sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as fp:
+        for chunk in iter(lambda: fp.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+# ───────────── shard run ────────────────────────────────────────────────
+
+def run_shard(source: Source, i: int, n: int) -> str:
+    """Scrape block *i*/*n* of *source*; return the manifest path."""
+    os.makedirs(source.out_dir, exist_ok=True)
+    os.makedirs(shard_dir(source.cfg), exist_ok=True)
+    tasks = shard_block(source.candidates(), i, n)
+
+    memo = open_memo(source.cfg)
+    try:
+        results = run_pipeline(source, tasks, memo)
+    finally:
+        memo.close()
+
+    part, manifest = _paths(source.cfg, source.name, i, n)
+    with open(part, "w", encoding="utf-8") as fp:
+        for task, rows in results:
+            fp.write(json.dumps({"task": task.isoformat(), "rows": rows}) + "\n")
+
+    meta = {
+        "source":  source.name,
+        "shard":   i,
+        "of":      n,
+        "start":   source.start.isoformat(),
+        "end":     source.end.isoformat(),
+        "first":   tasks[0].isoformat() if tasks else None,
+        "last":    tasks[-1].isoformat() if tasks else None,
+        "tasks":   len(tasks),
+        "hits":    sum(1 for _, rows in results if rows),
+        "version": source.version,
+        "sha256":  _sha256(part),
+    }
+    with open(manifest, "w", encoding="utf-8") as fp:
+        json.dump(meta, fp, indent=1)
+    print(f"✅ {source.name} shard {i}/{n}: {meta['hits']}/{len(tasks)} tasks → {part}")
+    return manifest
+
+# ───────────── merge ────────────────────────────────────────────────────
+
+def merge(source: Source) -> None:
+    """Validate every shard manifest of *source* and emit the canonical CSVs."""
+    found = sorted(glob.glob(os.path.join(shard_dir(source.cfg), f"{source.name}.part-*-of-*.json")))
+    if not found:
+        raise FileNotFoundError(f"no shard manifests for {source.name} in {shard_dir(source.cfg)}")
+
+    metas = []
+    for path in found:
+        with open(path, encoding="utf-8") as fp:
+            metas.append(json.load(fp))
+    sizes = {m["of"] for m in metas}
+    if len(sizes) != 1:
+        raise ValueError(f"{source.name}: manifests from different shard counts {sorted(sizes)}")
+    n = sizes.pop()
+    if sorted(m["shard"] for m in metas) != list(range(n)):
+        have = sorted(m["shard"] for m in metas)
+        raise ValueError(f"{source.name}: expected shards 0..{n - 1}, found {have}")
+    versions = {m["version"] for m in metas}
+    if versions != {source.version}:
+        raise ValueError(f"{source.name}: shards were parsed with parser version(s) {sorted(versions)}, "
+                         f"this checkout has {source.version} – re‑run the stale shards")
+
+    expected = source.candidates()
+    results: list = []
+    for meta in sorted(metas, key=lambda m: m["shard"]):
+        i = meta["shard"]
+        if (to_date(meta["start"]), to_date(meta["end"])) != (source.start, source.end):
+            raise ValueError(f"{source.name} shard {i}: window {meta['start']}…{meta['end']} "
+                             f"differs from config {source.start}…{source.end}")
+        part, _ = _paths(source.cfg, source.name, i, n)
+        if _sha256(part) != meta["sha256"]:
+            raise ValueError(f"{source.name} shard {i}: {part} does not match its manifest")
+        with open(part, encoding="utf-8") as fp:
+            block = [json.loads(line) for line in fp]
+        if [to_date(r["task"]) for r in block] != shard_block(expected, i, n):
+            raise ValueError(f"{source.name} shard {i}: task list differs from the configured window")
+        results.extend((to_date(r["task"]), r["rows"]) for r in block)
+
+    os.makedirs(source.out_dir, exist_ok=True)
+    source.emit(results)
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Low‑latency polling ("watch") mode
+==================================
+Instead of rerunning the whole config window, poll every TSO for the days
+still missing from its output and append them as soon as they appear.
+
+* The poll window is `[last settled day + 1, today]`, capped at
+  `WATCH_LOOKBACK` days back – older holes are left to the batch run.  A
+  day is settled once it was fetched *after* it ended and every output has
+  all its hours; until then it is re‑polled and its rows replaced, so a
+  partial same‑day table (NOSBiH fills missing actuals with the plan) is
+  corrected later.  State lives in `OUTPUT_DIR/.watch_state.json`.
+* Each source uses its own URL logic (MEPSO `url_variants`, OST suffix ×
+  folder scheme restricted to same‑day filenames, NOSBiH `date=` POST).
+* GETs are conditional (`If-None-Match` / `If-Modified-Since`), so an
+  unchanged file costs a 304, no parse and no further URL variants for
+  that task.  Validators are only kept for
+  URLs whose rows were appended – a failed poll re‑downloads next round.
+* Per source, the poll interval doubles after every empty poll (up to
+  `WATCH_MAX_INTERVAL`) and resets to `WATCH_INTERVAL` once a day lands.
+
+Point `BASE_URLS` in config.yaml at a local mock server to test offline:
+
+    python -m energy_scrapers.main --target all --watch --once
+"""
+from __future__ import annotations
+import json, os, time, pandas as pd
+from datetime import date, timedelta
+from energy_scrapers.framework import Source, run_pipeline
+from energy_scrapers.memo import open_memo
+
+STATE_FILE           = ".watch_state.json"
+DEFAULT_INTERVAL     = 300     # seconds between polls while data flows
+DEFAULT_MAX_INTERVAL = 3600    # backoff ceiling
+DEFAULT_LOOKBACK     = 3       # days behind *today* still polled
+
+
+def _load_state(path: str) -> dict:
+    state = {}
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as fp:
+            state = json.load(fp)
+    state.setdefault("validators", {})
+    state.setdefault("settled", {})
+    return state
+
+
+def _save_state(path: str, state: dict) -> None:
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as fp:
+        json.dump(state, fp, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def _complete(frames: dict[str, pd.DataFrame], day: str) -> bool:
+    """Every output has ≥ 24 rows for *day* and no blank value in them."""
+    for df in frames.values():
+        rows = df[df.iloc[:, 0].astype(str).str[:10] == day]
+        vals = rows.drop(columns=[c for c in ("date", "hour", "datetime") if c in rows.columns])
+        if len(rows) < 24 or vals.isna().any(axis=None):
+            return False
+    return True
+
+
+def poll(cls: type[Source], cfg: dict, state: dict, memo=None,
+         today: date | None = None) -> list[date]:
+    """One conditional poll of *cls*; return the days appended to its outputs."""
+    today    = today or date.today()
+    lookback = int(cfg.get("WATCH_LOOKBACK", DEFAULT_LOOKBACK))
+    settled  = state.setdefault("settled", {}).get(cls.name)
+    if settled is not None:
+        settled = date.fromisoformat(settled)
+    else:                                         # batch output: its last day may be partial
+        latest  = cls(cfg).latest_day()
+        settled = latest - timedelta(days=1) if latest else None
+    first = today - timedelta(days=lookback)
+    if settled is not None:
+        first = max(first, settled + timedelta(days=1))
+    if first > today:
+        return []
+
+    source = cls(cfg, start=first, end=today)
+    known  = state.setdefault("validators", {}).setdefault(source.name, {})
+    source.validators = dict(known)               # committed below only for appended days
+    results = [(t, rows) for t, rows in
+               run_pipeline(source, source.watch_candidates(), memo, progress=False) if rows]
+    days = sorted({r["date"] for _, rows in results for r in rows})
+    if days:
+        # restrict the dense grid to the days that actually landed
+        source.start, source.end = date.fromisoformat(days[0]), date.fromisoformat(days[-1])
+        source.append(results)
+        for task, _ in results:
+            for req in source.requests(task):
+                if req.url in source.validators:
+                    known[req.url] = source.validators[req.url]
+
+    # this poll ran after every day < today ended and either appended it or
+    # found it unchanged: complete days on disk are final from here on
+    outputs = {f: pd.read_csv(os.path.join(source.out_dir, f), dtype=str)
+               for f in source.outputs if os.path.exists(os.path.join(source.out_dir, f))}
+    nxt = first
+    while outputs and nxt < today and _complete(outputs, nxt.isoformat()):
+        state["settled"][cls.name] = nxt.isoformat()
+        nxt += timedelta(days=1)
+    return [date.fromisoformat(d) for d in days]
+
+
+def watch(classes: list[type[Source]], cfg: dict, once: bool = False) -> None:
+    """Poll *classes* forever (or one round with *once*), with backoff."""
+    base    = float(cfg.get("WATCH_INTERVAL", DEFAULT_INTERVAL))
+    ceiling = float(cfg.get("WATCH_MAX_INTERVAL", DEFAULT_MAX_INTERVAL))
+    os.makedirs(cfg["OUTPUT_DIR"], exist_ok=True)
+    state_path = os.path.join(cfg["OUTPUT_DIR"], STATE_FILE)
+    state      = _load_state(state_path)
+    memo       = open_memo(cfg)
+    sched      = {cls: {"misses": 0, "due": 0.0} for cls in classes}
+
+    try:
+        while True:
+            now = time.monotonic()
+            for cls, slot in sched.items():
+                if slot["due"] > now:
+                    continue
+                try:
+                    days = poll(cls, cfg, state, memo)
+                except Exception as exc:          # network hiccup – back off
+                    print(f"⚠️  {cls.name}: poll failed – {exc}")
+                    days = []
+                if days:
+                    print(f"🆕 {cls.name}: appended {', '.join(d.isoformat() for d in days)}")
+                    slot["misses"], delay = 0, base
+                else:                             # base, 2×base, 4×base … ceiling
+                    delay = min(base * 2 ** slot["misses"], ceiling)
+                    slot["misses"] += 1
+                slot["due"] = time.monotonic() + delay
+                _save_state(state_path, state)
+            if once:
+                break
+            time.sleep(max(1.0, min(s["due"] for s in sched.values()) - time.monotonic()))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        memo.close()
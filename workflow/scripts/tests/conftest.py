@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+"""Shared fixtures: a running mock TSO and configs pointing at it."""
+from __future__ import annotations
+import contextlib, io, os, sys
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from mock_tso import MockTSO                                     # noqa: E402
+from energy_scrapers.framework import run_source                 # noqa: E402
+
+
+@pytest.fixture
+def tso():
+    with MockTSO() as mock:
+        yield mock
+
+
+@pytest.fixture
+def make_cfg(tso):
+    """cfg(out_dir, start, end, **extra) → config dict served by *tso*."""
+    def cfg(out: str, start: str, end: str, **extra) -> dict:
+        return {"START_DATE": start, "END_DATE": end, "OUTPUT_DIR": str(out), "MAX_WORKERS": 4,
+                "PARSE_MEMO": "", "BASE_URLS": tso.base_urls(), **extra}
+    return cfg
+
+
+def quiet_run(source) -> None:
+    """run_source without the progress bars and warnings."""
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        run_source(source)
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+"""
+Local mock of the MEPSO / OST / NOSBiH endpoints
+================================================
+Serves generated PDFs, workbooks and AJAX tables for a short window so the
+scrapers can run offline through `BASE_URLS`.  GETs carry an ETag and honour
+`If-None-Match` (304); every request is recorded in `MockTSO.log`.
+
+The default window exercises the awkward cases: a day missing everywhere,
+a MEPSO day only under the third URL variant after a garbage first one, a
+23‑value MEPSO row, OST workbooks under next‑month folders plus a duplicate
+report date, a NOSBiH day answering HTTP 500 and a placeholder MEPSO file
+for the day after the window.
+"""
+from __future__ import annotations
+import hashlib, http.server, io, json, threading, urllib.parse
+from datetime import date, timedelta
+from openpyxl import Workbook
+
+START = date(2025, 3, 25)
+DAYS  = 10
+
+# ───────────── PDF with Cyrillic glyphs (pdfminer maps afii names) ──────
+_CYR = {c: 128 + i for i, c in enumerate("вкупнохецтгасф")}
+_GLYPH = {"в": "afii10067", "к": "afii10076", "у": "afii10085", "п": "afii10081", "н": "afii10079",
+          "о": "afii10080", "х": "afii10087", "е": "afii10070", "ц": "afii10088", "т": "afii10084",
+          "г": "afii10068", "а": "afii10065", "с": "afii10083", "ф": "afii10086"}
+
+
+def _enc(line: str) -> str:
+    return "".join(f"\\{_CYR[c]:03o}" if c in _CYR else c for c in line)
+
+
+def pdf(lines: list[str]) -> bytes:
+    """Single‑page PDF with one text line per entry."""
+    body = " ".join(f"BT /F1 6 Tf 10 {100 + 12 * i} Td ({_enc(l)}) Tj ET" for i, l in enumerate(lines)).encode()
+    diffs = " ".join("/" + _GLYPH[c] for c in _CYR).encode()
+    objs = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 1400 300] /Contents 4 0 R "
+        b"/Resources << /Font << /F1 5 0 R >> >> >>",
+        b"<< /Length %d >>\nstream\n" % len(body) + body + b"\nendstream",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica "
+        b"/Encoding << /Type /Encoding /Differences [128 " + diffs + b"] >> >>",
+    ]
+    out, offsets = b"%PDF-1.4\n", []
+    for i, obj in enumerate(objs, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % i + obj + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objs) + 1)
+    out += b"".join(b"%010d 00000 n \n" % o for o in offsets)
+    return out + b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objs) + 1, xref)
+
+
+def xlsx(rep: date, base: float, gap: int = 170) -> bytes:
+    """OST workbook: report date in C158, hourly load in F160:F183 (*gap* blank)."""
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Publikime AL"
+    ws["C158"] = rep.strftime("%d.%m.%Y")
+    for r in range(160, 184):
+        ws[f"F{r}"] = base + r * 0.5 if r != gap else None
+    buf = io.BytesIO()
+    wb.save(buf)
+    return buf.getvalue()
+
+
+def nosbih_table(day: date, hours: int = 24) -> str:
+    """NOSBiH production table; hours past *hours* have no actuals yet."""
+    rows = "".join(
+        f"<tr><td>{h + 1:02d}:00</td><td>1</td><td>{300 + h if h < hours else ''}</td>"
+        f"<td>{900 + (0 if 3 < h < 8 else h) if h < hours else ''}</td><td>{950 + h}</td></tr>"
+        for h in range(24))
+    return ('<table id="productionTable"><thead><tr><th>h</th><th>x</th>'
+            '<th id="label-production-hydropower">g</th><th id="label-consumption-actual">a</th>'
+            f'<th id="label-consumption-planned">p</th></tr></thead><tbody>{rows}</tbody></table>')
+
+# ───────────── content ──────────────────────────────────────────────────
+
+class MockTSO:
+    """Mutable mock content + a threaded HTTP server (use as context manager)."""
+
+    MEPSO = "/mepso/files/mk/dnevni"
+    OST   = "/ost/wp-content/uploads"
+    AJAX  = "/nosbih/en/wp-admin/admin-ajax.php"
+
+    def __init__(self, start: date = START, days: int = DAYS) -> None:
+        self.start  = start
+        self.files: dict[str, bytes] = {}
+        self.nosbih: dict[date, str | None] = {}     # None → HTTP 500
+        self.log: list[str] = []
+        self._lock = threading.Lock()
+        for i in range(days):
+            self._publish_day(i)
+        # the next day's MEPSO report is already up but does not parse yet
+        self.files[self.MEPSO + "/" + urllib.parse.quote(self.mepso_names(start + timedelta(days))[0])] = \
+            b"placeholder"
+
+    def republish_mepso(self, day: date, bump: float) -> None:
+        """Replace *day*'s MEPSO report with one whose hourly load is *bump* higher."""
+        i = (day - self.start).days
+        self.files[self.MEPSO + "/" + urllib.parse.quote(self.mepso_names(day)[i % 3 if i != 6 else 2])] = \
+            pdf([self._mepso_line(i, bump)])
+
+    def _mepso_line(self, i: int, bump: float = 0) -> str:
+        d = self.start + timedelta(i)
+        return f"Total consumption {d.day * 1000 + 500},5 " + " ".join(
+            f"{600 + h + i + bump},{h}" for h in range(24 if i != 5 else 23))
+
+    def _publish_day(self, i: int) -> None:
+        d = self.start + timedelta(i)
+        self.nosbih[d] = None if i == 4 else "<p>no table</p>" if i == 7 else nosbih_table(d)
+        if i == 3:                                   # missing everywhere but NOSBiH
+            return
+        names = self.mepso_names(d)
+        line  = self._mepso_line(i)
+        gen   = ["вкупно хец " + " ".join(f"{10 + h},{i}" for h in range(24)),
+                 "вкупно фец " + f"{800 + i},0 " + " ".join(f"{h},5" for h in range(24))]
+        if i == 6:                                   # garbage first variant → fallback
+            self.files[self.MEPSO + "/" + urllib.parse.quote(names[0])] = b"not a pdf"
+        self.files[self.MEPSO + "/" + urllib.parse.quote(names[i % 3 if i != 6 else 2])] = \
+            pdf([line] + gen[: 1 + (i % 2)])
+        if i == 4:
+            return
+        folder = d if i % 2 else date(d.year + (d.month == 12), d.month % 12 + 1, 1)
+        self.files[self.ost_path(d, ["", "-1", "-002"][i % 3], folder)] = xlsx(d, 100 * i)
+        if i == 2:                                   # duplicate report date, fuller workbook
+            nd = d + timedelta(1)
+            self.files[self.ost_path(nd, "-4", nd)] = xlsx(d, 7, gap=0)
+
+    @staticmethod
+    def mepso_names(d: date) -> list[str]:
+        dmy, yy = d.strftime("%d.%m.%Y"), d.strftime("%y%m%d")
+        return [f"Информација за {dmy}.pdf", f"Информација {dmy}.pdf", f"WebReport-{yy}_mk.pdf"]
+
+    def ost_path(self, d: date, suffix: str, folder: date) -> str:
+        return (f"{self.OST}/{folder.year}/{folder.month:02d}/"
+                f"Publikimi-te-dhenave-{d.day:02d}.{d.month:02d}.{d.year}{suffix}.xlsx")
+
+    # ── HTTP ──
+    def __enter__(self) -> "MockTSO":
+        mock = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args) -> None:
+                pass
+
+            def _reply(self, status: int, body: bytes = b"", etag: str | None = None) -> None:
+                self.send_response(status)
+                if etag:
+                    self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self) -> None:
+                body = mock.files.get(self.path)
+                if body is None:
+                    mock._record(f"404 {self.path}")
+                    return self._reply(404, b"not found")
+                etag = '"%s"' % hashlib.md5(body).hexdigest()
+                if self.headers.get("If-None-Match") == etag:
+                    mock._record(f"304 {self.path}")
+                    return self._reply(304)
+                mock._record(f"200 {self.path}")
+                self._reply(200, body, etag)
+
+            def do_POST(self) -> None:
+                n    = int(self.headers.get("Content-Length", 0))
+                form = urllib.parse.parse_qs(self.rfile.read(n).decode())
+                ds   = form["production"][0].split("=")[1]
+                day  = date(int(ds[6:10]), int(ds[3:5]), int(ds[0:2]))
+                html = mock.nosbih.get(day, "<p>no table</p>")
+                mock._record(f"POST {day}")
+                if html is None:
+                    return self._reply(500)
+                self._reply(200, json.dumps({"data": html}).encode())
+
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _record(self, entry: str) -> None:
+        with self._lock:
+            self.log.append(entry)
+
+    def base_urls(self) -> dict[str, str]:
+        return {"mepso": self.url + self.MEPSO, "ost": self.url + self.OST, "nosbih": self.url + self.AJAX}
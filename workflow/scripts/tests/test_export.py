@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""Export cache: rebuild only on real changes, never leave stale tables."""
+from __future__ import annotations
+import os
+import numpy as np, pandas as pd
+import pytest
+
+from energy_scrapers import export
+
+OSEMOSYS = [os.path.join("osemosys", f"{t}.csv") for t in ("SpecifiedDemandProfile", "YearSplit",
+                                                          "SpecifiedAnnualDemand")]
+
+
+def _write_mepso(out_dir, start: str, end: str, offset: float = 0.0) -> None:
+    days = pd.date_range(start, end, freq="D")
+    df   = pd.DataFrame({"date": np.repeat(days.strftime("%Y-%m-%d"), 24),
+                         "hour": np.tile(np.arange(1, 25), len(days))})
+    df["demand"] = 600.0 + df["hour"] * 10 + offset
+    df.to_csv(os.path.join(out_dir, "mepso_data.csv"), index=False)
+
+
+@pytest.fixture
+def opts(tmp_path):
+    return {**export.DEFAULTS, "DIR": str(tmp_path / "export")}
+
+
+def _built(tmp_path, opts) -> bool:
+    return export.export(str(tmp_path), opts)[0]
+
+
+def test_first_build_writes_every_table(tmp_path, opts):
+    _write_mepso(tmp_path, "2024-01-01", "2024-12-31")
+    built, status = export.export(str(tmp_path), opts)
+    assert built and status == {"pypsa": export.WRITTEN, "osemosys": export.WRITTEN}
+    for rel in [export.PYPSA_LOAD, *OSEMOSYS]:
+        assert os.path.getsize(os.path.join(opts["DIR"], rel)) > 0
+    profile = pd.read_csv(os.path.join(opts["DIR"], OSEMOSYS[0]))
+    assert profile["FUEL"].unique().tolist() == ["ELCMKDXX02"]
+    assert profile.groupby("YEAR")["VALUE"].sum().round(9).tolist() == [1.0]
+
+
+def test_unchanged_inputs_hit_the_stat_fast_path(tmp_path, opts):
+    _write_mepso(tmp_path, "2024-01-01", "2024-12-31")
+    assert _built(tmp_path, opts)
+    manifest = os.path.join(opts["DIR"], export.MANIFEST)
+    before   = os.stat(manifest).st_mtime_ns
+    assert not _built(tmp_path, opts)
+    assert os.stat(manifest).st_mtime_ns == before        # not even re‑hashed
+
+
+def test_same_bytes_rewritten_do_not_rebuild(tmp_path, opts):
+    _write_mepso(tmp_path, "2024-01-01", "2024-12-31")
+    assert _built(tmp_path, opts)
+    load  = os.path.join(opts["DIR"], export.PYPSA_LOAD)
+    bytes_before = open(load, "rb").read()
+    os.utime(load, ns=(0, 0))
+    _write_mepso(tmp_path, "2024-01-01", "2024-12-31")    # new mtime, same content
+    assert not _built(tmp_path, opts)
+    assert open(load, "rb").read() == bytes_before
+    assert os.stat(load).st_mtime_ns > 0                  # touched for make/snakemake
+    assert not _built(tmp_path, opts)                     # stats refreshed → fast path again
+
+
+def test_changed_input_rebuilds(tmp_path, opts):
+    _write_mepso(tmp_path, "2024-01-01", "2024-12-31")
+    assert _built(tmp_path, opts)
+    _write_mepso(tmp_path, "2024-01-01", "2024-12-31", offset=5.0)
+    assert _built(tmp_path, opts)
+    load = pd.read_csv(os.path.join(opts["DIR"], export.PYPSA_LOAD), index_col=0)
+    assert load["MK"].min() == 615.0
+
+
+def test_changed_settings_rebuild(tmp_path, opts):
+    _write_mepso(tmp_path, "2024-01-01", "2024-12-31")
+    assert _built(tmp_path, opts)
+    assert _built(tmp_path, {**opts, "REGION": "WB6"})
+    annual = pd.read_csv(os.path.join(opts["DIR"], OSEMOSYS[2]))
+    assert annual["REGION"].tolist() == ["WB6"]
+
+
+def test_sub_year_window_writes_pypsa_only(tmp_path, opts):
+    _write_mepso(tmp_path, "2024-01-01", "2024-12-31")
+    assert _built(tmp_path, opts)
+    _write_mepso(tmp_path, "2025-01-01", "2025-04-25")    # the shipped config window
+    built, status = export.export(str(tmp_path), opts)
+    assert built and status["pypsa"] == export.WRITTEN
+    assert status["osemosys"].startswith("skipped") and "MK" in status["osemosys"]
+    assert os.path.exists(os.path.join(opts["DIR"], export.PYPSA_LOAD))
+    assert not any(os.path.exists(os.path.join(opts["DIR"], rel)) for rel in OSEMOSYS)
+    assert export.export(str(tmp_path), opts) == (False, status)   # skip is cached too
+
+
+def test_failed_export_leaves_nothing(tmp_path, opts):
+    with pytest.raises(ValueError, match="no demand outputs"):
+        export.export(str(tmp_path), opts)
+    assert not os.path.exists(opts["DIR"])
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""Parse memo: version tags, warm reruns and memoised misses."""
+from __future__ import annotations
+import importlib, os, sqlite3, subprocess, sys
+from datetime import timedelta
+import pytest
+
+from mock_tso import START
+from energy_scrapers.framework import run_pipeline
+from energy_scrapers.main import SOURCES
+from energy_scrapers.memo import ParseMemo, open_memo, parser_version
+
+SCRIPTS = os.path.join(os.path.dirname(__file__), "..")
+
+
+def _module(tmp_path, name: str, body: str):
+    (tmp_path / f"{name}.py").write_text(f"def parse(x):\n    {body}\n")
+    sys.path.insert(0, str(tmp_path))
+    try:
+        return importlib.import_module(name)
+    finally:
+        sys.path.remove(str(tmp_path))
+
+
+def test_version_follows_code_and_constants(tmp_path):
+    a, b, c = (_module(tmp_path, n, body) for n, body in
+               (("memo_a", "return x"), ("memo_b", "return x + 1"), ("memo_c", "return x")))
+    assert parser_version(a.parse) == parser_version(c.parse)          # same source text
+    assert parser_version(a.parse) != parser_version(b.parse)          # edited body
+    assert parser_version(a.parse, 2_000) != parser_version(a.parse, 3_000)
+    assert parser_version(a.parse, "pdfminer 1") != parser_version(a.parse, "pdfminer 2")
+
+
+@pytest.mark.parametrize("lib, module, attr", [
+    ("pdfplumber", "download_mepso",    "MepsoDemand"),
+    ("pdfminer",   "mepso_gen_scraper", "MepsoGeneration"),
+    ("openpyxl",   "download_ost",      "OstSource"),
+    ("bs4",        "download_nosbih",   "NosbihSource"),
+])
+def test_version_follows_library_version(lib, module, attr):
+    code = (f"import {lib}; {lib}.__version__ = {{!r}}; "
+            f"from energy_scrapers import {module}; print({module}.{attr}.version)")
+    run  = lambda v: subprocess.run([sys.executable, "-c", code.format(v)], cwd=SCRIPTS, check=True,
+                                    capture_output=True, text=True).stdout.strip()
+    mod  = importlib.import_module(f"energy_scrapers.{module}")
+    real = getattr(mod, attr).version
+    assert run(getattr(importlib.import_module(lib), "__version__")) == real
+    assert run("0.0.0-other") != real
+
+
+def test_version_includes_parse_method():
+    cls  = SOURCES["nosbih"]
+    mod  = sys.modules[cls.__module__]
+    without = parser_version(mod._col_index, mod._replace_flat_stretches, mod._num, mod.parse_production,
+                             f"bs4 {mod.bs4.__version__}")
+    assert cls.version != without
+    assert cls.version == parser_version(cls.parse, mod._col_index, mod._replace_flat_stretches, mod._num,
+                                         mod.parse_production, f"bs4 {mod.bs4.__version__}")
+
+
+def test_warm_rerun_skips_parser_and_memoises_misses(tmp_path, make_cfg, monkeypatch):
+    cfg   = make_cfg(tmp_path, START.isoformat(), (START + timedelta(10)).isoformat(),
+                     PARSE_MEMO=str(tmp_path / "memo.sqlite"))
+    cls   = SOURCES["mepso"]
+    calls = []
+    real  = cls.parse
+    monkeypatch.setattr(cls, "parse", lambda self, view: calls.append(1) or real(self, view))
+
+    def run() -> tuple[list, ParseMemo]:
+        memo = open_memo(cfg)
+        try:
+            return run_pipeline(cls(cfg), cls(cfg).candidates(), memo, progress=False), memo
+        finally:
+            memo.close()
+
+    cold, memo = run()
+    parsed = len(calls)
+    assert memo.misses == parsed and memo.hits == 0
+    with sqlite3.connect(tmp_path / "memo.sqlite") as db:
+        misses = db.execute("SELECT COUNT(*) FROM memo WHERE result = 'null'").fetchone()[0]
+    assert misses >= 2                       # garbage variant + same‑day placeholder
+
+    calls.clear()
+    warm, memo = run()
+    assert warm == cold
+    assert calls == [] and memo.hits == parsed and memo.misses == 0
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""Panel alignment around the 2025 DST switches (CET/CEST)."""
+from __future__ import annotations
+import numpy as np, pandas as pd
+import pytest
+
+from energy_scrapers.panel import build_panel
+
+SOURCES = [
+    ("mk.csv", "MK", "Europe/Skopje",   "date_hour", ["demand"]),
+    ("ba.csv", "BA", "Europe/Sarajevo", "datetime",  ["demand"]),
+]
+
+
+def _write(tmp_path, days: list[str]) -> None:
+    """24 local hour ordinals per day, value = day index × 100 + hour."""
+    mk = pd.DataFrame([(d, h, i * 100 + h) for i, d in enumerate(days) for h in range(1, 25)],
+                      columns=["date", "hour", "demand"])
+    mk.to_csv(tmp_path / "mk.csv", index=False)
+    ba = pd.DataFrame({"datetime": pd.to_datetime(mk["date"]) + pd.to_timedelta(mk["hour"] - 1, unit="h"),
+                       "demand": mk["demand"] + 0.5})
+    ba.to_csv(tmp_path / "ba.csv", index=False)
+
+
+@pytest.fixture
+def spring(tmp_path):
+    _write(tmp_path, ["2025-03-29", "2025-03-30", "2025-03-31"])
+    return build_panel(str(tmp_path), SOURCES)
+
+
+@pytest.fixture
+def autumn(tmp_path):
+    _write(tmp_path, ["2025-10-25", "2025-10-26", "2025-10-27"])
+    return build_panel(str(tmp_path), SOURCES)
+
+
+def test_columns_are_country_variable(spring):
+    assert spring.columns.names == ["country", "variable"]
+    assert spring.columns.tolist() == [("BA", "demand"), ("MK", "demand")]
+    assert str(spring.index.tz) == "UTC" and spring.index.name == "utc_timestamp"
+
+
+def test_spring_forward_drops_the_24th_ordinal(spring):
+    # 2025‑03‑30 local midnight is 23:00Z the day before (still CET) …
+    assert spring.loc["2025-03-29 23:00Z", ("MK", "demand")] == 101
+    # … and its 23rd hour ends at local midnight (CEST): 21:00Z
+    assert spring.loc["2025-03-30 21:00Z", ("MK", "demand")] == 123
+    assert spring.loc["2025-03-30 22:00Z", ("MK", "demand")] == 201    # next day, not ordinal 24
+    assert 124 not in spring[("MK", "demand")].to_numpy()
+    assert 124.5 not in spring[("BA", "demand")].to_numpy()
+    assert spring.index[0] == pd.Timestamp("2025-03-28 23:00Z")
+    assert spring.index[-1] == pd.Timestamp("2025-03-31 21:00Z")
+    assert len(spring) == 24 + 23 + 24 and spring.notna().all(axis=None)
+
+
+def test_fall_back_leaves_the_25th_slot_empty(autumn):
+    # 2025‑10‑26 local midnight is 22:00Z (CEST); the day has 25 hours
+    assert autumn.loc["2025-10-25 22:00Z", ("MK", "demand")] == 101
+    assert autumn.loc["2025-10-26 21:00Z", ("MK", "demand")] == 124
+    assert autumn.loc["2025-10-26 22:00Z"].isna().all()                # never published
+    assert autumn.loc["2025-10-26 23:00Z", ("MK", "demand")] == 201    # next local midnight (CET)
+    assert len(autumn) == 24 + 25 + 24 and int(autumn.isna().sum().sum()) == 2
+    np.testing.assert_array_equal(autumn[("BA", "demand")].dropna().to_numpy() - 0.5,
+                                  autumn[("MK", "demand")].dropna().to_numpy())
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""Spooled payloads: memory vs disk, the view reader, close semantics, download."""
+from __future__ import annotations
+import gc, hashlib, http.server, io, threading
+import pytest, requests
+
+from energy_scrapers.payload import NotModified, Payload, download, reader
+
+BODY = bytes(range(256)) * 40                      # 10 KiB
+
+
+def _payload(body: bytes, max_size: int, chunk: int = 1000) -> Payload:
+    p = Payload(max_size)
+    for i in range(0, len(body), chunk):
+        p.write(body[i:i + chunk])
+    return p.seal()
+
+
+def test_small_body_stays_in_memory():
+    with _payload(BODY, max_size=len(BODY)) as p:
+        assert not p.spilled and p.size == len(BODY)
+        assert bytes(p.view) == BODY and p.digest == hashlib.sha256(BODY).hexdigest()
+
+
+def test_large_body_spills_to_mmap():
+    with _payload(BODY, max_size=4096) as p:
+        assert p.spilled and p._map is not None
+        assert bytes(p.view) == BODY and p.digest == hashlib.sha256(BODY).hexdigest()
+        assert p.view.readonly
+
+
+def test_empty_body():
+    with Payload().seal() as p:
+        assert bytes(p.view) == b"" and p.size == 0
+
+
+def test_from_path_maps_the_file(tmp_path):
+    (tmp_path / "f.bin").write_bytes(BODY)
+    with Payload.from_path(str(tmp_path / "f.bin")) as p:
+        assert p.spilled and bytes(p.view) == BODY
+
+
+def test_reader_seek_and_read():
+    r = reader(memoryview(BODY))
+    assert r.seekable() and r.readable()
+    assert r.read(3) == BODY[:3] and r.tell() == 3
+    assert r.seek(-2, io.SEEK_END) == len(BODY) - 2
+    assert r.read() == BODY[-2:] and r.read() == b"" and r.read(5) == b""
+    assert r.seek(-10**6, io.SEEK_CUR) == 0                          # clamped at start
+    assert r.seek(10, io.SEEK_SET) == 10 and r.read(-1) == BODY[10:]
+    r.seek(5)
+    buf = bytearray(4)
+    assert r.readinto(buf) == 4 and bytes(buf) == BODY[5:9]
+    assert io.BufferedReader(reader(BODY)).read() == BODY                # usable by libraries
+
+
+def test_closing_a_reader_keeps_the_payload():
+    with _payload(BODY, max_size=4096) as p:
+        r = reader(p.view)
+        r.read(10)
+        r.close()
+        assert r.closed and bytes(p.view[:4]) == BODY[:4]
+
+
+@pytest.mark.parametrize("max_size", [4096, 1 << 20])
+def test_close_with_live_slice(max_size):
+    p = _payload(BODY, max_size)
+    part = p.view[100:110]
+    p.close()                                        # must not raise BufferError
+    assert p.view is None and p._map is None and p._file is None
+    assert bytes(part) == BODY[100:110]              # slice still valid until dropped
+    del part
+    gc.collect()
+    p.close()                                        # idempotent
+
+
+# ───────────── download against a local server ──────────────────────────
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        if self.path == "/body":
+            if self.headers.get("If-None-Match") == '"v1"':
+                self.send_response(304)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("ETag", '"v1"')
+            self.send_header("Content-Length", str(len(BODY)))
+            self.end_headers()
+            self.wfile.write(BODY)
+        else:
+            self.send_response(404)
+            self.send_header("Content-Length", "9")
+            self.end_headers()
+            self.wfile.write(b"not found")
+
+
+@pytest.fixture(scope="module")
+def url():
+    srv = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{srv.server_port}"
+    srv.shutdown()
+    srv.server_close()
+
+
+@pytest.mark.parametrize("max_size, spilled", [(1 << 20, False), (1024, True)])
+def test_download_streams_into_payload(url, max_size, spilled):
+    with download(url + "/body", max_size=max_size) as p:
+        assert p.spilled is spilled and bytes(p.view) == BODY
+        assert p.validators == {"ETag": '"v1"'}
+
+
+def test_download_misses_and_304(url):
+    with requests.Session() as sess:
+        assert download(url + "/missing", session=sess) is None
+        with pytest.raises(NotModified):
+            download(url + "/body", session=sess, headers={"If-None-Match": '"v1"'})
+        with download(url + "/body", session=sess) as p:     # same pooled connection still usable
+            assert bytes(p.view) == BODY
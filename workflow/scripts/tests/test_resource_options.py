@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""VRE engine on synthetic rasters: CF models, bounds, aggregation, chunking."""
+from __future__ import annotations
+import numpy as np, pandas as pd
+import pytest
+
+from energy_scrapers import get_resource_options as gro
+
+
+@pytest.fixture(scope="module")
+def grid(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("vre"))
+    gro.synthetic(path, ny=12, nx=15, hours=200, seed=1)
+    weather = gro.load_weather(path)
+    regions, names, masks = gro.load_eligibility(path)
+    return weather, regions, names, masks
+
+
+def test_wind_curve_endpoints():
+    cf = gro.wind_cf(np.array([0.0, 2.9, 3.0, 12.0, 20.0, 25.0, 25.1, 40.0], dtype=np.float32))
+    assert cf[:3].tolist() == [0.0, 0.0, 0.0]           # below / at cut‑in
+    assert cf[3:6].tolist() == [1.0, 1.0, 1.0]          # rated up to cut‑out
+    assert cf[6:].tolist() == [0.0, 0.0]                # off above cut‑out
+    mid = gro.wind_cf(np.array([7.5], dtype=np.float32))[0]
+    assert 0 < mid < 1 and cf.dtype == np.float32
+
+
+def test_pv_endpoints():
+    temp = np.full(4, 25.0, dtype=np.float32)
+    cf   = gro.pv_cf(np.array([0.0, -5.0, 1000.0, 5000.0], dtype=np.float32), temp)
+    assert cf[0] == 0 and cf[1] == 0                    # no (or negative) irradiance
+    assert 0 < cf[2] < 0.85                             # NOCT heating derates STC output
+    assert cf[3] == 1.0                                 # clipped
+    cold, hot = (gro.pv_cf(np.array([800.0], np.float32), np.array([t], np.float32))[0] for t in (0.0, 40.0))
+    assert cold > hot
+
+
+def test_profiles_bounded_with_zone_columns(grid):
+    profiles, _ = gro.get_resource_options(*grid)
+    assert profiles.columns.names == ["technology", "country", "region"]
+    expected = [(t, c, r) for t in gro.TECHS
+                for c, r in [(c, f"{c}{i}") for c in ("AL", "MK", "BA") for i in (1, 2)]
+                + [(c, gro.TOTAL) for c in ("AL", "BA", "MK")]]
+    assert sorted(profiles.columns) == sorted(expected)
+    assert len(profiles) == 200 and str(profiles.index.tz) == "UTC"
+    values = profiles.to_numpy()
+    assert np.isfinite(values).all() and values.min() >= 0 and values.max() <= 1
+    assert profiles["solar"].max().max() > 0 and profiles["onwind"].max().max() > 0
+
+
+def test_totals_are_sums_of_regions(grid):
+    _, pot = gro.get_resource_options(*grid)
+    regional = pot[pot["region"] != gro.TOTAL].groupby(["technology", "country"])[["eligible_km2", "cells"]].sum()
+    totals   = pot[pot["region"] == gro.TOTAL].set_index(["technology", "country"])[["eligible_km2", "cells"]]
+    pd.testing.assert_frame_equal(totals.sort_index(), regional.sort_index(), check_dtype=False)
+    assert (pot["p_nom_max_mw"] == pot["eligible_km2"] * pot["technology"].map(
+        {t: p["capacity_per_km2"] for t, p in gro.TECHS.items()})).all()
+
+
+@pytest.mark.parametrize("chunk", [1, 7, 24, 1000])
+def test_chunking_does_not_change_results(grid, chunk):
+    ref_prof, ref_pot = gro.get_resource_options(*grid, chunk_hours=gro.DEFAULT_CHUNK)
+    prof, pot = gro.get_resource_options(*grid, chunk_hours=chunk)
+    np.testing.assert_allclose(prof.to_numpy(), ref_prof.to_numpy(), rtol=0, atol=1e-6)
+    pd.testing.assert_frame_equal(pot.drop(columns="mean_cf"), ref_pot.drop(columns="mean_cf"))
+    np.testing.assert_allclose(pot["mean_cf"], ref_pot["mean_cf"], atol=1e-6)
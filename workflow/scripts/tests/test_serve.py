@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""Query service: NaN‑aware aggregation, slicing, LRU cache, reloads."""
+from __future__ import annotations
+import json, os
+import numpy as np, pandas as pd
+import pytest
+
+from energy_scrapers.serve import QueryError, Store, aggregate
+
+SOURCES = [("mk.csv", "MK", "Europe/Skopje", "date_hour", ["demand"])]
+
+
+def _write(path, days: int = 5, base: float = 0.0) -> None:
+    dates = pd.date_range("2025-01-30", periods=days).strftime("%Y-%m-%d")
+    df = pd.DataFrame({"date": np.repeat(dates, 24), "hour": np.tile(np.arange(1, 25), days)})
+    df["demand"] = base + np.arange(len(df), dtype=float)
+    df.loc[df["hour"] == 3, "demand"] = np.nan
+    df.sample(frac=1, random_state=0).to_csv(path, index=False)      # unsorted on disk
+
+
+@pytest.fixture
+def store(tmp_path):
+    _write(tmp_path / "mk.csv")
+    return Store(str(tmp_path), cache_size=2, sources=SOURCES)
+
+
+@pytest.mark.parametrize("agg, expected", [
+    ("mean",  [1.5, np.nan, 5.0, 7.0]),
+    ("sum",   [3.0, np.nan, 5.0, 14.0]),
+    ("min",   [1.0, np.nan, 5.0, 6.0]),
+    ("max",   [2.0, np.nan, 5.0, 8.0]),
+    ("count", [2.0, 0.0, 1.0, 2.0]),
+])
+def test_aggregate_ignores_nan(agg, expected):
+    keys   = np.array([1, 1, 1, 2, 2, 3, 4, 4, 4])
+    values = np.array([1, np.nan, 2, np.nan, np.nan, 5, 6, np.nan, 8], dtype=float)
+    out_keys, out = aggregate(keys, values, agg)
+    assert out_keys.tolist() == [1, 2, 3, 4]
+    np.testing.assert_array_equal(out, expected)
+
+
+def test_aggregate_empty():
+    keys, out = aggregate(np.array([], dtype="datetime64[D]"), np.array([]), "sum")
+    assert len(keys) == 0 and len(out) == 0
+
+
+def test_table_is_sorted_and_sliced_by_day(store):
+    body = json.loads(store.query("mk", "demand", "2025-01-31", "2025-02-02"))
+    assert body["index"][0] == "2025-01-31" and body["index"][-1] == "2025-02-02"
+    assert len(body["index"]) == 3 * 24 and body["hour"][:3] == [1, 2, 3]
+    assert body["values"][0] == 24.0 and body["values"][2] is None          # hour 3 → null
+    assert json.loads(store.query("mk", "demand", "2025-02-10"))["values"] == []
+    month = json.loads(store.query("mk", "demand", freq="month", agg="count"))
+    assert month["index"] == ["2025-01", "2025-02"] and month["values"] == [46.0, 69.0]
+
+
+def test_bad_requests(store):
+    with pytest.raises(QueryError) as exc:
+        store.query("nope", "demand")
+    assert exc.value.status == 404
+    with pytest.raises(QueryError):
+        store.query("mk", "demand", freq="week")
+    with pytest.raises(QueryError):
+        store.query("mk", "demand", start="31/01/2025")
+
+
+def test_lru_evicts_oldest(store):
+    a, b, c = ("mk", "demand", "2025-01-30"), ("mk", "demand", "2025-01-31"), ("mk", "demand", "2025-02-01")
+    for q in (a, b, a, c):                         # a refreshed, so b is the oldest when c lands
+        store.query(*q)
+    assert (store.hits, store.misses) == (1, 3)
+    store.query(*a)
+    assert store.hits == 2
+    store.query(*b)
+    assert store.misses == 4 and len(store._cache) == 2
+
+
+def test_changed_file_drops_cache(store, tmp_path):
+    first = json.loads(store.query("mk", "demand", "2025-01-30", "2025-01-30"))
+    assert store.refresh() == []
+    _write(tmp_path / "mk.csv", days=6, base=1000.0)
+    os.utime(tmp_path / "mk.csv", ns=(1, 1))
+    assert store.refresh() == ["mk"] and len(store._cache) == 0
+    again = json.loads(store.query("mk", "demand", "2025-01-30", "2025-01-30"))
+    assert again["values"][0] == first["values"][0] + 1000
+    info = json.loads(store.info())
+    assert info["mk"]["rows"] == 6 * 24 and info["mk"]["last"] == "2025-02-04"
+    os.remove(tmp_path / "mk.csv")
+    assert store.refresh() == ["mk"] and json.loads(store.info()) == {}
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""Watch mode against the mock TSO: append, 304s, partial days, failures."""
+from __future__ import annotations
+import filecmp, os, re, urllib.parse
+from datetime import timedelta
+import pytest
+
+from conftest import quiet_run
+from mock_tso import START, nosbih_table
+from energy_scrapers import watch
+from energy_scrapers.main import SOURCES
+
+END   = START + timedelta(9)
+TODAY = END + timedelta(1)
+
+
+def _poll(cls, cfg, state, today=TODAY):
+    return watch.poll(cls, cfg, state, today=today)
+
+
+def test_watch_append_matches_batch(tmp_path, make_cfg):
+    full, inc = tmp_path / "full", tmp_path / "inc"
+    for cls in SOURCES.values():
+        quiet_run(cls(make_cfg(full, START.isoformat(), END.isoformat())))
+        quiet_run(cls(make_cfg(inc, START.isoformat(), (START + timedelta(5)).isoformat())))
+
+    state = watch._load_state(str(inc / watch.STATE_FILE))
+    for cls in SOURCES.values():
+        _poll(cls, make_cfg(inc, "2025-01-01", "2025-01-01", WATCH_LOOKBACK=10), state)
+    for f in sorted(os.listdir(full)):
+        if f.endswith(".csv"):
+            assert filecmp.cmp(full / f, inc / f, shallow=False), f
+
+
+def _task(path: str) -> str:
+    """Filename date a MEPSO / OST request belongs to (its pipeline task)."""
+    name = urllib.parse.unquote(path.rsplit("/", 1)[1])
+    m = re.search(r"(\d{2})\.(\d{2})\.(\d{4})|WebReport-(\d{2})(\d{2})(\d{2})", name)
+    d, mo, y = m.group(1, 2, 3) if m.group(1) else (m.group(6), m.group(5), "20" + m.group(4))
+    return f"{path.split('/')[1]} {y}-{mo}-{d}"
+
+
+def test_second_poll_is_conditional(tmp_path, make_cfg, tso):
+    cfg   = make_cfg(tmp_path, "2025-01-01", "2025-01-01", WATCH_LOOKBACK=10)
+    state = watch._load_state(str(tmp_path / watch.STATE_FILE))
+    for name in ("mepso", "ost"):
+        assert _poll(SOURCES[name], cfg, state)
+
+    before = {f: (tmp_path / f).read_bytes() for f in os.listdir(tmp_path) if f.endswith(".csv")}
+    n = len(tso.log)
+    for name in ("mepso", "ost"):
+        assert _poll(SOURCES[name], cfg, state) == []
+    revalidated, after_304 = set(), []
+    for entry in tso.log[n:]:
+        status, path = entry.split(" ", 1)
+        if _task(path) in revalidated:
+            after_304.append(entry)
+        if status == "304":
+            revalidated.add(_task(path))
+    assert revalidated and after_304 == []           # a 304 ends the task's URL search
+    assert {f: (tmp_path / f).read_bytes() for f in before} == before
+
+
+def test_unchanged_day_between_updates_is_kept(tmp_path, make_cfg, tso):
+    cfg   = make_cfg(tmp_path, "2025-01-01", "2025-01-01", WATCH_LOOKBACK=10)
+    state = watch._load_state(str(tmp_path / watch.STATE_FILE))
+    cls   = SOURCES["mepso"]
+    assert _poll(cls, cfg, state)
+    path  = tmp_path / "mepso_data.csv"
+    old   = path.read_text().splitlines()
+
+    first, gap, last = START + timedelta(4), START + timedelta(5), START + timedelta(6)
+    tso.republish_mepso(first, 100)
+    tso.republish_mepso(last, 100)
+    assert _poll(cls, cfg, state) == [first, last]
+    new = path.read_text().splitlines()
+    day_rows = lambda lines, d: [ln for ln in lines if ln.startswith(d.isoformat())]
+    assert day_rows(new, gap) == day_rows(old, gap) and "," not in day_rows(new, gap)[0][-1:]
+    assert day_rows(new, first) != day_rows(old, first) and day_rows(new, last) != day_rows(old, last)
+    assert [ln for ln in new if ln[:10] not in (first.isoformat(), last.isoformat())] == \
+           [ln for ln in old if ln[:10] not in (first.isoformat(), last.isoformat())]
+
+
+def test_append_refuses_other_header(tmp_path, make_cfg):
+    cfg   = make_cfg(tmp_path, "2025-01-01", "2025-01-01", WATCH_LOOKBACK=10)
+    state = watch._load_state(str(tmp_path / watch.STATE_FILE))
+    path  = tmp_path / "mepso_data.csv"
+    path.write_text("date,hour,load\n2024-01-01,1,500.0\n")
+    with pytest.raises(ValueError, match="columns differ"):
+        _poll(SOURCES["mepso"], cfg, state)
+    assert path.read_text() == "date,hour,load\n2024-01-01,1,500.0\n"
+
+
+def test_partial_day_is_repolled(tmp_path, make_cfg, tso):
+    day   = END
+    tso.nosbih[day] = nosbih_table(day, hours=12)
+    cfg   = make_cfg(tmp_path, "2025-01-01", "2025-01-01", WATCH_LOOKBACK=1)
+    state = watch._load_state(str(tmp_path / watch.STATE_FILE))
+    cls   = SOURCES["nosbih"]
+
+    assert _poll(cls, cfg, state, today=day) == [day - timedelta(1), day]
+    assert state["settled"]["nosbih"] == (day - timedelta(1)).isoformat()
+    gen = (tmp_path / "nosbih_generation.csv").read_text()
+    assert gen.count(day.isoformat()) == 12
+
+    tso.nosbih[day] = nosbih_table(day)                 # actuals complete
+    assert _poll(cls, cfg, state, today=day + timedelta(1)) == [day]
+    assert state["settled"]["nosbih"] == day.isoformat()
+    assert (tmp_path / "nosbih_generation.csv").read_text().count(day.isoformat()) == 24
+    demand = (tmp_path / "nosbih_demand.csv").read_text()
+    assert f"{day} 11:00:00,911" in demand and f"{day} 11:00:00,961" not in demand
+
+    n = len(tso.log)
+    assert _poll(cls, cfg, state, today=day + timedelta(1)) == []
+    assert tso.log[n:] == [f"POST {day + timedelta(1)}"]   # only the new day is left
+
+
+def test_failed_append_keeps_no_validators(tmp_path, make_cfg, tso, monkeypatch):
+    cfg   = make_cfg(tmp_path, "2025-01-01", "2025-01-01", WATCH_LOOKBACK=10)
+    state = watch._load_state(str(tmp_path / watch.STATE_FILE))
+    cls   = SOURCES["ost"]
+
+    def broken(self, results):
+        raise OSError("disk full")
+    monkeypatch.setattr(cls, "append", broken)
+    with pytest.raises(OSError):
+        _poll(cls, cfg, state)
+    assert state["validators"].get("ost", {}) == {}
+    monkeypatch.undo()
+
+    n = len(tso.log)
+    assert _poll(cls, cfg, state)
+    assert not any(entry.startswith("304") for entry in tso.log[n:])
+    assert state["validators"]["ost"]